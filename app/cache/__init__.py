@@ -1,3 +1,4 @@
-from .image_cache import ImageCache, get_image_cache
+from .image_cache import ImageCache, get_cache_stats, get_image_cache
+from .memory_pressure import MemoryPressureMonitor
 
-__all__ = ["ImageCache", "get_image_cache"]
+__all__ = ["ImageCache", "get_cache_stats", "get_image_cache", "MemoryPressureMonitor"]
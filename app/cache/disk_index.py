@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class DiskIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def total_size(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def size_of(self, key: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else None
+
+    def contains(self, key: str) -> bool:
+        return self.size_of(key) is not None
+
+    def record(self, key: str, size: int, last_access: Optional[float] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                (key, size, time.time() if last_access is None else last_access),
+            )
+
+    def record_many(self, rows: Iterable[tuple[str, int, float]]):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    def touch(self, key: str):
+        with self._lock:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+
+    def remove(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return 0
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return int(row[0])
+
+    def oldest(self, limit: int) -> list[tuple[str, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT ?", (limit,)
+            ).fetchall()
+        return [(key, int(size)) for key, size in rows]
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
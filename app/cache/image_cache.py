@@ -1,41 +1,79 @@
 import hashlib
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
-from collections import OrderedDict
-from PySide6.QtGui import QPixmap
+from typing import Callable, Optional
+from PySide6.QtGui import QImage, QImageReader, QPixmap
 from PySide6.QtCore import QSize
 
+from app.core.config import (
+    CACHE_ROOT, COVER_DISK_CACHE_MB, COVER_MEMORY_CACHE_MB, DISK_CACHE_MB, MEMORY_CACHE_MB, MEMORY_CACHE_POLICY,
+)
+from .disk_index import DiskIndex
+from .policies import make_policy
+
+# namespace -> (directory under CACHE_ROOT, memory MB, disk MB)
+NAMESPACES = {
+    "pages": ("images", MEMORY_CACHE_MB, DISK_CACHE_MB),
+    "covers": ("covers", COVER_MEMORY_CACHE_MB, COVER_DISK_CACHE_MB),
+}
 
-class ImageCache:
 
+class ImageCache:
+    EVICT_BATCH = 32
+    LAYOUT = "hex2x2"
 
     def __init__(self, 
-                 max_memory_mb: int = 200,
-                 max_disk_mb: int = 1000,
-                 cache_dir: Optional[Path] = None):
+                 max_memory_mb: int = MEMORY_CACHE_MB,
+                 max_disk_mb: int = DISK_CACHE_MB,
+                 cache_dir: Optional[Path] = None,
+                 policy: str = MEMORY_CACHE_POLICY):
 
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self._memory_budget = self.max_memory_bytes
 
-
-        self._memory_cache: OrderedDict[str, tuple[QPixmap, int]] = OrderedDict()
+        self._memory_cache: dict[str, tuple[QImage | QPixmap, int]] = {}
         self._memory_size = 0
+        self._policy = make_policy(policy)
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+        self._loading: dict[str, threading.Event] = {}
 
 
         if cache_dir is None:
-            cache_dir = Path.home() / ".cache" / "mangareader" / "images"
+            cache_dir = CACHE_ROOT / "images"
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
 
-        self._disk_size = self._calculate_disk_usage()
+        self._index = DiskIndex(self.cache_dir / "index.db")
+        if self._index.get_meta("layout") != self.LAYOUT:
+            self._migrate_flat_layout()
+        if self._index.get_meta("built") is None:
+            self._rebuild_index()
+        self._disk_size = self._index.total_size()
 
-    def _calculate_disk_usage(self) -> int:
+    def _migrate_flat_layout(self):
 
-        total = 0
         for file in self.cache_dir.glob("*.cache"):
-            total += file.stat().st_size
-        return total
+            target = self._get_cache_path(file.stem)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            file.replace(target)
+        self._index.set_meta("layout", self.LAYOUT)
+
+    def _rebuild_index(self):
+
+        # One-time import of entries written before the index existed.
+        rows = []
+        for file in self.cache_dir.glob("*/*/*.cache"):
+            stat = file.stat()
+            rows.append((file.stem, stat.st_size, stat.st_mtime))
+        self._index.record_many(rows)
+        self._index.set_meta("built", str(time.time()))
 
     def _make_cache_key(self, identifier: str, size: Optional[QSize] = None) -> str:
 
@@ -47,107 +85,254 @@ class ImageCache:
 
     def _get_cache_path(self, cache_key: str) -> Path:
 
-        return self.cache_dir / f"{cache_key}.cache"
+        return self.cache_dir / cache_key[:2] / cache_key[2:4] / f"{cache_key}.cache"
 
-    def _evict_memory_lru(self, required_bytes: int):
+    def _evict_memory(self, required_bytes: int):
 
-        while self._memory_size + required_bytes > self.max_memory_bytes and self._memory_cache:
-
-            key, (pixmap, size) = self._memory_cache.popitem(last=False)
+        while self._memory_size + required_bytes > self._memory_budget and self._memory_cache:
+            key = self._policy.victim(self._memory_budget)
+            if key is None:
+                break
+            _, size = self._memory_cache.pop(key)
             self._memory_size -= size
 
     def _evict_disk_lru(self, required_bytes: int):
 
-        if self._disk_size + required_bytes <= self.max_disk_bytes:
-            return
+        while self._disk_size + required_bytes > self.max_disk_bytes:
+            oldest = self._index.oldest(self.EVICT_BATCH)
+            if not oldest:
+                break
 
+            for cache_key, size in oldest:
+                if self._disk_size + required_bytes <= self.max_disk_bytes:
+                    return
+                self._get_cache_path(cache_key).unlink(missing_ok=True)
+                self._index.remove(cache_key)
+                self._disk_size -= size
 
-        cache_files = sorted(
-            self.cache_dir.glob("*.cache"),
-            key=lambda p: p.stat().st_atime
-        )
+    def _size_in_bytes(self, image: QImage | QPixmap) -> int:
 
-        for file in cache_files:
-            if self._disk_size + required_bytes <= self.max_disk_bytes:
-                break
+        if isinstance(image, QImage):
+            return image.sizeInBytes()
+        return image.width() * image.height() * max(1, image.depth()) // 8
 
-            size = file.stat().st_size
-            file.unlink()
-            self._disk_size -= size
+    def get_meta(self, name: str) -> Optional[str]:
 
-    def _estimate_pixmap_size(self, pixmap: QPixmap) -> int:
+        return self._index.get_meta(name)
 
+    def set_meta(self, name: str, value: str):
 
-        return pixmap.width() * pixmap.height() * 4
+        self._index.set_meta(name, value)
 
-    def get(self, identifier: str, size: Optional[QSize] = None) -> Optional[QPixmap]:
+    @property
+    def memory_size(self) -> int:
 
-        cache_key = self._make_cache_key(identifier, size)
+        return self._memory_size
 
+    @property
+    def memory_budget(self) -> int:
 
-        if cache_key in self._memory_cache:
+        return self._memory_budget
 
-            pixmap, pixmap_size = self._memory_cache.pop(cache_key)
-            self._memory_cache[cache_key] = (pixmap, pixmap_size)
-            return pixmap
+    def set_limits(self, max_memory_mb: int, max_disk_mb: int):
 
+        with self._lock:
+            self.max_memory_bytes = max_memory_mb * 1024 * 1024
+            self.max_disk_bytes = max_disk_mb * 1024 * 1024
+            self._memory_budget = self.max_memory_bytes
+            self._evict_memory(0)
+            self._evict_disk_lru(0)
 
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            pixmap = QPixmap()
-            if pixmap.load(str(cache_path)):
+    def set_memory_budget(self, budget_bytes: int):
 
-                pixmap_size = self._estimate_pixmap_size(pixmap)
-                self._evict_memory_lru(pixmap_size)
-                self._memory_cache[cache_key] = (pixmap, pixmap_size)
-                self._memory_size += pixmap_size
+        with self._lock:
+            self._memory_budget = max(0, min(budget_bytes, self.max_memory_bytes))
+            self._evict_memory(0)
 
+    def _memory_get(self, cache_key: str) -> Optional[QImage | QPixmap]:
 
-                cache_path.touch()
-                return pixmap
+        entry = self._memory_cache.get(cache_key)
+        if entry is None:
+            return None
+        self._policy.touch(cache_key)
+        return entry[0]
 
-        return None
+    def _memory_put(self, cache_key: str, pixmap: QPixmap):
 
-    def put(self, identifier: str, pixmap: QPixmap, size: Optional[QSize] = None, save_to_disk: bool = True):
+        pixmap_size = self._size_in_bytes(pixmap)
+        old = self._memory_cache.pop(cache_key, None)
+        if old is not None:
+            self._memory_size -= old[1]
+            self._policy.remove(cache_key)
+        self._evict_memory(pixmap_size)
+        self._memory_cache[cache_key] = (pixmap, pixmap_size)
+        self._policy.admit(cache_key, pixmap_size)
+        self._memory_size += pixmap_size
+
+    def _load_disk(self, cache_key: str) -> Optional[QImage]:
+
+        if not self._index.contains(cache_key):
+            return None
+
+        # QImage rather than QPixmap: the disk tier is read from worker threads too.
+        reader = QImageReader(str(self._get_cache_path(cache_key)))
+        reader.setAutoTransform(True)
+        image = reader.read()
+        if image.isNull():
+            self._drop_disk_entry(cache_key)
+            return None
+        self._index.touch(cache_key)
+        return image
+
+    def get_memory(self, identifier: str, size: Optional[QSize] = None,
+                   count: bool = True) -> Optional[QImage | QPixmap]:
 
         cache_key = self._make_cache_key(identifier, size)
-        pixmap_size = self._estimate_pixmap_size(pixmap)
+        with self._lock:
+            pixmap = self._memory_get(cache_key)
+            if count:
+                if pixmap is not None:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+            return pixmap
 
+    def get(self, identifier: str, size: Optional[QSize] = None) -> Optional[QImage | QPixmap]:
 
-        self._evict_memory_lru(pixmap_size)
-        self._memory_cache[cache_key] = (pixmap, pixmap_size)
-        self._memory_size += pixmap_size
+        return self.get_or_load(identifier, None, size)
+
+    def get_or_load(self, identifier: str, load: Optional[Callable[[], Optional[QImage | QPixmap]]],
+                    size: Optional[QSize] = None) -> Optional[QImage | QPixmap]:
+
+        cache_key = self._make_cache_key(identifier, size)
+        first_look = True
+        while True:
+            with self._lock:
+                pixmap = self._memory_get(cache_key)
+                if first_look:
+                    if pixmap is not None:
+                        self._hits += 1
+                    else:
+                        self._misses += 1
+                if pixmap is not None:
+                    return pixmap
+                first_look = False
+                pending = self._loading.get(cache_key)
+                if pending is None:
+                    pending = self._loading[cache_key] = threading.Event()
+                    break
+            # Another caller is loading this key; wait and re-check memory.
+            pending.wait()
+
+        try:
+            pixmap = self._load_disk(cache_key)
+            if pixmap is not None:
+                with self._lock:
+                    self._disk_hits += 1
+            if pixmap is None and load is not None:
+                pixmap = load()
+            if pixmap is None or pixmap.isNull():
+                return None
+            with self._lock:
+                self._memory_put(cache_key, pixmap)
+            return pixmap
+        finally:
+            with self._lock:
+                self._loading.pop(cache_key).set()
 
+    def put(self, identifier: str, pixmap: QPixmap, size: Optional[QSize] = None, save_to_disk: bool = True):
+
+        cache_key = self._make_cache_key(identifier, size)
+        with self._lock:
+            self._memory_put(cache_key, pixmap)
 
         if save_to_disk:
-            cache_path = self._get_cache_path(cache_key)
-            file_size = cache_path.stat().st_size if cache_path.exists() else 0
+            estimated_size = self._size_in_bytes(pixmap) // 2
+            self._write_disk(cache_key, estimated_size, lambda path: pixmap.save(str(path), "PNG"))
+
+    def put_bytes(self, identifier: str, data: bytes, size: Optional[QSize] = None):
+
+        cache_key = self._make_cache_key(identifier, size)
+        self._write_disk(cache_key, len(data), lambda path: path.write_bytes(data) == len(data))
 
+    def get_bytes(self, identifier: str, size: Optional[QSize] = None) -> Optional[bytes]:
 
-            estimated_disk_size = pixmap_size // 2  
-            self._evict_disk_lru(estimated_disk_size)
+        cache_key = self._make_cache_key(identifier, size)
+        if not self._index.contains(cache_key):
+            return None
+        try:
+            data = self._get_cache_path(cache_key).read_bytes()
+        except FileNotFoundError:
+            self._drop_disk_entry(cache_key)
+            return None
+        self._index.touch(cache_key)
+        with self._lock:
+            self._disk_hits += 1
+        return data
+
+    def _write_disk(self, cache_key: str, estimated_size: int, write) -> bool:
+
+        cache_path = self._get_cache_path(cache_key)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._evict_disk_lru(estimated_size)
+
+        # Write beside the target and rename so concurrent writers and readers never see a partial file.
+        tmp_path = cache_path.with_name(f"{cache_key}.{threading.get_ident()}.tmp")
+        try:
+            if not write(tmp_path):
+                return False
+            new_file_size = tmp_path.stat().st_size
+            os.replace(tmp_path, cache_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            file_size = self._index.size_of(cache_key) or 0
+            self._index.record(cache_key, new_file_size)
+            self._disk_size += new_file_size - file_size
+        return True
+
+    def get_path(self, identifier: str, size: Optional[QSize] = None) -> Optional[Path]:
+
+        cache_key = self._make_cache_key(identifier, size)
+        if not self._index.contains(cache_key):
+            return None
+        cache_path = self._get_cache_path(cache_key)
+        if not cache_path.exists():
+            self._drop_disk_entry(cache_key)
+            return None
+        self._index.touch(cache_key)
+        return cache_path
 
-            if pixmap.save(str(cache_path), "PNG"):
+    def _drop_disk_entry(self, cache_key: str):
 
-                new_file_size = cache_path.stat().st_size
-                self._disk_size += new_file_size - file_size
+        with self._lock:
+            self._get_cache_path(cache_key).unlink(missing_ok=True)
+            self._disk_size -= self._index.remove(cache_key)
 
     def has(self, identifier: str, size: Optional[QSize] = None) -> bool:
 
         cache_key = self._make_cache_key(identifier, size)
-        return (cache_key in self._memory_cache or 
-                self._get_cache_path(cache_key).exists())
+        with self._lock:
+            if cache_key in self._memory_cache:
+                return True
+        return self._index.contains(cache_key)
 
     def clear_memory(self):
 
-        self._memory_cache.clear()
-        self._memory_size = 0
+        with self._lock:
+            self._memory_cache.clear()
+            self._policy.clear()
+            self._memory_size = 0
 
     def clear_disk(self):
 
-        for file in self.cache_dir.glob("*.cache"):
-            file.unlink()
-        self._disk_size = 0
+        with self._lock:
+            for cache_key in self._index.keys():
+                self._get_cache_path(cache_key).unlink(missing_ok=True)
+            self._index.clear()
+            self._disk_size = 0
 
     def clear_all(self):
 
@@ -156,22 +341,42 @@ class ImageCache:
 
     def get_stats(self) -> dict:
 
-        return {
-            "memory_items": len(self._memory_cache),
-            "memory_size_mb": self._memory_size / (1024 * 1024),
-            "memory_max_mb": self.max_memory_bytes / (1024 * 1024),
-            "disk_size_mb": self._disk_size / (1024 * 1024),
-            "disk_max_mb": self.max_disk_bytes / (1024 * 1024),
-        }
+        with self._lock:
+            # Misses are memory misses; disk_hits counts those the disk tier then served.
+            lookups = self._hits + self._misses
+            return {
+                "policy": self._policy.name,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                **{f"policy_{name}": value for name, value in self._policy.stats().items()},
+                "memory_items": len(self._memory_cache),
+                "memory_size_mb": self._memory_size / (1024 * 1024),
+                "memory_max_mb": self.max_memory_bytes / (1024 * 1024),
+                "memory_budget_mb": self._memory_budget / (1024 * 1024),
+                "disk_items": self._index.count(),
+                "disk_size_mb": self._disk_size / (1024 * 1024),
+                "disk_max_mb": self.max_disk_bytes / (1024 * 1024),
+            }
+
+
+
+_global_caches: dict[str, ImageCache] = {}
+_global_cache_lock = threading.Lock()
 
 
+def get_image_cache(namespace: str = "pages") -> ImageCache:
 
-_global_cache: Optional[ImageCache] = None
+    with _global_cache_lock:
+        if namespace not in _global_caches:
+            if namespace not in NAMESPACES:
+                raise ValueError(f"Unknown cache namespace {namespace!r}, expected one of {tuple(NAMESPACES)}")
+            dirname, memory_mb, disk_mb = NAMESPACES[namespace]
+            _global_caches[namespace] = ImageCache(memory_mb, disk_mb, CACHE_ROOT / dirname)
+        return _global_caches[namespace]
 
 
-def get_image_cache() -> ImageCache:
+def get_cache_stats() -> dict[str, dict]:
 
-    global _global_cache
-    if _global_cache is None:
-        _global_cache = ImageCache()
-    return _global_cache
+    return {namespace: get_image_cache(namespace).get_stats() for namespace in NAMESPACES}
@@ -0,0 +1,37 @@
+from typing import Callable, Optional
+
+from app.core.config import LOW_MEMORY_MB, MIN_MEMORY_CACHE_MB
+from app.core.memory import system_memory
+
+from .image_cache import ImageCache
+
+
+class MemoryPressureMonitor:
+    def __init__(self,
+                 cache: ImageCache,
+                 low_memory_mb: int = LOW_MEMORY_MB,
+                 min_budget_mb: int = MIN_MEMORY_CACHE_MB,
+                 read_memory: Callable[[], Optional[tuple[int, int]]] = system_memory):
+        self.cache = cache
+        self.low_memory_bytes = low_memory_mb * 1024 * 1024
+        self.min_budget_bytes = min_budget_mb * 1024 * 1024
+        self._read_memory = read_memory
+
+    def check(self) -> Optional[int]:
+        memory = self._read_memory()
+        if memory is None:
+            return None
+        available, _ = memory
+
+        if available < self.low_memory_bytes:
+            # Give back the shortfall, but never grow the budget while under pressure.
+            deficit = self.low_memory_bytes - available
+            budget = max(self.min_budget_bytes, self.cache.memory_size - deficit)
+            budget = min(budget, self.cache.memory_budget)
+        elif available > self.low_memory_bytes * 2:
+            budget = self.cache.max_memory_bytes
+        else:
+            return self.cache.memory_budget
+
+        self.cache.set_memory_budget(budget)
+        return budget
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Optional
+
+
+class LRUPolicy:
+    name = "lru"
+
+    def __init__(self):
+        self._order: OrderedDict[str, int] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def touch(self, key: str):
+        self._order.move_to_end(key)
+
+    def admit(self, key: str, size: int):
+        self._order[key] = size
+
+    def remove(self, key: str):
+        self._order.pop(key, None)
+
+    def victim(self, budget: int) -> Optional[str]:
+        if not self._order:
+            return None
+        key, _ = self._order.popitem(last=False)
+        return key
+
+    def clear(self):
+        self._order.clear()
+
+    def stats(self) -> dict:
+        return {"resident": len(self._order)}
+
+
+# Full 2Q: first-time entries pass through a FIFO, and only keys seen again after
+# leaving it are promoted to the main LRU, so one sequential pass cannot flush the hot set.
+class TwoQueuePolicy:
+    name = "2q"
+    # Larger than the textbook 25% so a full read-ahead window still fits in probation.
+    IN_SHARE = 0.5
+    GHOST_ENTRIES = 2048
+
+    def __init__(self, in_share: float = IN_SHARE, ghost_entries: int = GHOST_ENTRIES):
+        self.in_share = in_share
+        self.ghost_entries = ghost_entries
+        self._in: OrderedDict[str, int] = OrderedDict()
+        self._in_bytes = 0
+        self._main: OrderedDict[str, int] = OrderedDict()
+        self._ghosts: OrderedDict[str, None] = OrderedDict()
+        self.promotions = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._in or key in self._main
+
+    def __len__(self) -> int:
+        return len(self._in) + len(self._main)
+
+    def touch(self, key: str):
+        # Re-references while still in the FIFO are treated as correlated and ignored.
+        if key in self._main:
+            self._main.move_to_end(key)
+
+    def admit(self, key: str, size: int):
+        self.remove(key)
+        if key in self._ghosts:
+            del self._ghosts[key]
+            self._main[key] = size
+            self.promotions += 1
+        else:
+            self._in[key] = size
+            self._in_bytes += size
+
+    def remove(self, key: str):
+        if key in self._in:
+            self._in_bytes -= self._in.pop(key)
+        self._main.pop(key, None)
+
+    def victim(self, budget: int) -> Optional[str]:
+        if self._in and (self._in_bytes > budget * self.in_share or not self._main):
+            key, size = self._in.popitem(last=False)
+            self._in_bytes -= size
+            self._ghosts[key] = None
+            while len(self._ghosts) > self.ghost_entries:
+                self._ghosts.popitem(last=False)
+            return key
+        if self._main:
+            key, _ = self._main.popitem(last=False)
+            return key
+        return None
+
+    def clear(self):
+        self._in.clear()
+        self._in_bytes = 0
+        self._main.clear()
+        self._ghosts.clear()
+
+    def stats(self) -> dict:
+        return {
+            "resident": len(self),
+            "probation": len(self._in),
+            "protected": len(self._main),
+            "ghosts": len(self._ghosts),
+            "promotions": self.promotions,
+        }
+
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, TwoQueuePolicy)}
+
+
+def make_policy(name: str):
+    if name not in POLICIES:
+        raise ValueError(f"Unknown cache policy {name!r}, expected one of {tuple(POLICIES)}")
+    return POLICIES[name]()
@@ -0,0 +1,40 @@
+import threading
+from typing import Optional
+
+
+class BandwidthMeter:
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.bytes_per_sec: Optional[float] = None
+        self.seconds_per_fetch: Optional[float] = None
+        self.bytes_per_fetch: Optional[float] = None
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1 - self.alpha) * current
+
+    def record(self, nbytes: int, seconds: float, transfer_seconds: Optional[float] = None):
+        # Throughput comes from the body transfer alone; latency would make small pages look like a slow link.
+        seconds = max(seconds, 1e-3)
+        transfer_seconds = seconds if transfer_seconds is None else max(transfer_seconds, 1e-3)
+        with self._lock:
+            self.bytes_per_sec = self._ewma(self.bytes_per_sec, nbytes / transfer_seconds)
+            self.seconds_per_fetch = self._ewma(self.seconds_per_fetch, seconds)
+            self.bytes_per_fetch = self._ewma(self.bytes_per_fetch, float(nbytes))
+            self.samples += 1
+
+    def estimate_fetch_seconds(self, nbytes: Optional[int] = None) -> Optional[float]:
+        with self._lock:
+            if nbytes is None or not self.bytes_per_sec:
+                return self.seconds_per_fetch
+            return nbytes / self.bytes_per_sec
+
+    def reset(self):
+        with self._lock:
+            self.bytes_per_sec = None
+            self.seconds_per_fetch = None
+            self.bytes_per_fetch = None
+            self.samples = 0
@@ -0,0 +1,53 @@
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Optional
+
+
+class OperationCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self):
+        if self._cancelled:
+            raise OperationCancelled()
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]):
+        with self._lock:
+            registered = not self._cancelled
+            if registered:
+                self._callbacks.append(callback)
+        if not registered:
+            callback()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+
+def watch(cancel: Optional[CancelToken], callback: Callable[[], None]):
+    return cancel.on_cancel(callback) if cancel is not None else nullcontext()
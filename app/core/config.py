@@ -4,3 +4,39 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
 MANGA_DIR = DATA_DIR / "manga"
 DB_PATH = DATA_DIR / "app.db"
+CACHE_ROOT = Path.home() / ".cache" / "mangareader"
+
+NEXT_CHAPTER_PREFETCH_AT = 0.75
+NEXT_CHAPTER_PREFETCH_PAGES = 3
+
+PAGE_QUALITY = "auto"
+DATA_SAVER_BELOW_KBPS = 400
+
+DECODE_WORKERS = 2
+RESIZE_DEBOUNCE_MS = 120
+
+MEMORY_CACHE_MB = 200
+DISK_CACHE_MB = 1000
+MIN_MEMORY_CACHE_MB = 32
+LOW_MEMORY_MB = 512
+MEMORY_CHECK_MS = 5000
+MEMORY_CACHE_POLICY = "2q"
+COVER_MEMORY_CACHE_MB = 48
+COVER_DISK_CACHE_MB = 200
+
+DISCOVER_PREFETCH_PAGES = 2
+DISCOVER_LOAD_MORE_ROWS = 2
+DISCOVER_MAX_PAGES = 40
+
+RESPONSE_CACHE_MB = 16
+# Seconds a cached API response counts as fresh; older ones are served stale while a refresh runs.
+RESPONSE_TTLS = {
+    "anilist.trending": 30 * 60,
+    "anilist.search": 6 * 60 * 60,
+    "mangadex.search": 60 * 60,
+}
+RESPONSE_DEFAULT_TTL = 15 * 60
+RESPONSE_MAX_STALE = 7 * 24 * 60 * 60
+
+COVER_FETCH_WORKERS = 4
+COVER_PREFETCH_SCREENS = 1
@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.cancel import OperationCancelled
+from app.core.config import CACHE_ROOT, RESPONSE_CACHE_MB, RESPONSE_DEFAULT_TTL, RESPONSE_MAX_STALE, RESPONSE_TTLS
+
+
+@dataclass
+class CachedResponse:
+    value: Any
+    age: float
+    fresh: bool
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return sorted((_normalize(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    if isinstance(value, str):
+        # Both APIs match titles case-insensitively, so "One  Piece" and "one piece" share an entry.
+        return " ".join(value.split()).casefold()
+    return value
+
+
+class ResponseCache:
+    EVICT_BATCH = 16
+
+    def __init__(self,
+                 path: Optional[Path] = None,
+                 max_mb: float = RESPONSE_CACHE_MB,
+                 ttls: Optional[dict[str, float]] = None,
+                 default_ttl: float = RESPONSE_DEFAULT_TTL,
+                 max_stale: float = RESPONSE_MAX_STALE):
+        self.path = path or CACHE_ROOT / "responses.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttls = dict(RESPONSE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body TEXT NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+        self._size = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[dict]) -> str:
+        return f"{endpoint}?{json.dumps(_normalize(params or {}), sort_keys=True, separators=(',', ':'))}"
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[dict], allow_stale: bool = False) -> Optional[CachedResponse]:
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            age = now - row[1]
+            if age > self.ttl(endpoint) + self.max_stale:
+                self._delete(key)
+                self.misses += 1
+                return None
+            fresh = age <= self.ttl(endpoint)
+            if not fresh and not allow_stale:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return CachedResponse(json.loads(row[0]), age, fresh)
+
+    def put(self, endpoint: str, params: Optional[dict], value: Any):
+        key = self.make_key(endpoint, params)
+        body = json.dumps(value, separators=(",", ":"))
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO responses (key, endpoint, body, size, stored_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, size, now, now),
+            )
+            self._size += size
+            self._evict()
+
+    def fetch(self, endpoint: str, params: Optional[dict], load: Callable[[], Any]) -> Any:
+        hit = self.get(endpoint, params)
+        if hit is not None:
+            return hit.value
+        try:
+            value = load()
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            return self._stale_or_raise(endpoint, params, e)
+        self.put(endpoint, params, value)
+        return value
+
+    async def fetch_async(self, endpoint: str, params: Optional[dict], load: Callable[[], Awaitable[Any]]) -> Any:
+        hit = self.get(endpoint, params)
+        if hit is not None:
+            return hit.value
+        try:
+            value = await load()
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            return self._stale_or_raise(endpoint, params, e)
+        self.put(endpoint, params, value)
+        return value
+
+    def _stale_or_raise(self, endpoint: str, params: Optional[dict], error: Exception) -> Any:
+        # Serving an old response beats an error screen while the API is down or rate limiting us.
+        stale = self.get(endpoint, params, allow_stale=True)
+        if stale is None:
+            raise error
+        return stale.value
+
+    def _delete(self, key: str):
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= int(row[0])
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?", (self.EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= int(size)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            count = int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+        return {
+            "entries": count,
+            "size_kb": self._size / 1024,
+            "max_kb": self.max_bytes / 1024,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_global_response_cache: Optional[ResponseCache] = None
+_global_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _global_response_cache
+    with _global_lock:
+        if _global_response_cache is None:
+            _global_response_cache = ResponseCache()
+        return _global_response_cache
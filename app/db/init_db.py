@@ -1,7 +1,32 @@
+from sqlalchemy import inspect, text
 from sqlmodel import SQLModel
+from app.core.config import DB_PATH, DISK_CACHE_MB, MEMORY_CACHE_MB
 from app.db.session import engine
 from app.models import Manga, Progress, Settings, Chapter, Page, DownloadQueue
 
-def init_db():
+# Columns added to existing tables after their first release: table -> {column: DDL}
+ADDED_COLUMNS = {
+    Manga.__tablename__: {
+        "chapters_complete": "BOOLEAN NOT NULL DEFAULT 0",
+    },
+    Settings.__tablename__: {
+        "memory_cache_mb": f"INTEGER NOT NULL DEFAULT {MEMORY_CACHE_MB}",
+        "disk_cache_mb": f"INTEGER NOT NULL DEFAULT {DISK_CACHE_MB}",
+    },
+}
+
+def upgrade_schema():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
 
+def init_db():
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    upgrade_schema()
     SQLModel.metadata.create_all(engine)
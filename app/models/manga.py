@@ -24,5 +24,6 @@ class Manga(SQLModel, table=True):
     is_favorite: bool = Field(default=False)
     last_opened: Optional[datetime] = None
     open_count: int = Field(default=0)
+    chapters_complete: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
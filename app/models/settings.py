@@ -1,5 +1,9 @@
 from sqlmodel import SQLModel, Field
 
+from app.core.config import DISK_CACHE_MB, MEMORY_CACHE_MB
+
 class Settings(SQLModel, table=True):
     id: int | None = Field(default=1, primary_key=True)
     library_root: str
+    memory_cache_mb: int = Field(default=MEMORY_CACHE_MB)
+    disk_cache_mb: int = Field(default=DISK_CACHE_MB)
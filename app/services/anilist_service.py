@@ -1,5 +1,8 @@
 import requests
 
+from app.core.response_cache import get_response_cache
+from app.core.cancel import watch
+
 API = "https://graphql.anilist.co"
 
 MEDIA_FIELDS = """
@@ -25,12 +28,28 @@ coverImage { large }
 tags { name isAdult }
 """
 
-def _post(query, variables=None):
-    resp = requests.post(API, json={"query": query, "variables": variables or {}}, timeout=10)
-    resp.raise_for_status()
-    return resp.json().get("data", {})
+def _post(query, variables=None, cancel=None):
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    # requests cannot abort a POST that is still waiting for headers, so cancellation
+    # is checked around it and closes the connection while the body is streaming.
+    resp = requests.post(API, json={"query": query, "variables": variables or {}}, timeout=10, stream=True)
+    with resp, watch(cancel, resp.close):
+        try:
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            raise
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    return data.get("data", {})
+
+def _media(data):
+    return (data.get("Page") or {}).get("media") or []
 
-def trending(page=1, per_page=50):
+def trending(page=1, per_page=50, cancel=None):
     q = f"""
     query ($page:Int,$perPage:Int) {{ 
       Page(page:$page, perPage:$perPage) {{ 
@@ -45,10 +64,10 @@ def trending(page=1, per_page=50):
       }} 
     }} 
     """
-    data = _post(q, {"page": page, "perPage": per_page})
-    return (data.get("Page") or {}).get("media") or []
+    variables = {"page": page, "perPage": per_page}
+    return get_response_cache().fetch("anilist.trending", variables, lambda: _media(_post(q, variables, cancel)))
 
-def search(query, page=1, per_page=50):
+def search(query, page=1, per_page=50, cancel=None):
     q = f"""
     query ($search:String,$page:Int,$perPage:Int) {{ 
       Page(page:$page, perPage:$perPage) {{ 
@@ -64,5 +83,11 @@ def search(query, page=1, per_page=50):
       }} 
     }} 
     """
-    data = _post(q, {"search": query, "page": page, "perPage": per_page})
-    return (data.get("Page") or {}).get("media") or []
+    variables = {"search": query, "page": page, "perPage": per_page}
+    return get_response_cache().fetch("anilist.search", variables, lambda: _media(_post(q, variables, cancel)))
+
+def cached_trending(page=1, per_page=50):
+    return get_response_cache().get("anilist.trending", {"page": page, "perPage": per_page}, allow_stale=True)
+
+def cached_search(query, page=1, per_page=50):
+    return get_response_cache().get("anilist.search", {"search": query, "page": page, "perPage": per_page}, allow_stale=True)
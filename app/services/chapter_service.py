@@ -1,10 +1,74 @@
 import asyncio
+from typing import AsyncIterator
 from sqlmodel import select
 from app.models import Manga, Chapter, Page
 from app.db.session import get_session
-from app.sources.mangadex import MangaDexSource
+from app.sources.mangadex import get_mangadex_source
 
-async def fetch_and_store_chapters(manga_id: int) -> list[Chapter]:
+def _chapter_number_key(chapter: Chapter):
+    try:
+        return float(chapter.chapter_number)
+    except (TypeError, ValueError):
+        return 0
+
+def sort_chapters(chapters: list[Chapter]) -> list[Chapter]:
+    return sorted(chapters, key=_chapter_number_key)
+
+class _ChapterSync:
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.chapters: list[Chapter] = []
+        self.changed = asyncio.Event()
+        self.waiters = 0
+
+    def add(self, chapters: list[Chapter]):
+        self.chapters.extend(chapters)
+        self.changed.set()
+
+_chapter_syncs: dict[int, _ChapterSync] = {}
+
+def _start_sync(manga_id: int) -> _ChapterSync:
+    sync = _chapter_syncs.get(manga_id)
+    if sync is not None and not sync.task.done() and sync.task.get_loop() is asyncio.get_running_loop():
+        return sync
+    sync = _ChapterSync()
+    sync.task = asyncio.ensure_future(_sync_chapters(manga_id, sync))
+    sync.task.add_done_callback(lambda _: _end_sync(manga_id, sync))
+    _chapter_syncs[manga_id] = sync
+    return sync
+
+def _end_sync(manga_id: int, sync: _ChapterSync):
+    if _chapter_syncs.get(manga_id) is sync:
+        del _chapter_syncs[manga_id]
+    sync.changed.set()
+    if not sync.task.cancelled():
+        sync.task.exception()
+
+async def stream_chapters(manga_id: int) -> AsyncIterator[list[Chapter]]:
+    # Every caller for the same manga shares one feed download instead of storing it twice.
+    sync = _start_sync(manga_id)
+    sync.waiters += 1
+    sent = 0
+    try:
+        while True:
+            if sent < len(sync.chapters):
+                batch = sync.chapters[sent:]
+                sent += len(batch)
+                yield batch
+            elif sync.task.done():
+                sync.task.result()
+                return
+            else:
+                sync.changed.clear()
+                await sync.changed.wait()
+    finally:
+        sync.waiters -= 1
+        if sync.waiters == 0 and not sync.task.done():
+            if _chapter_syncs.get(manga_id) is sync:
+                del _chapter_syncs[manga_id]
+            sync.task.cancel()
+
+async def _sync_chapters(manga_id: int, sync: _ChapterSync):
     with get_session() as session:
         manga = session.get(Manga, manga_id)
         if not manga:
@@ -13,16 +77,24 @@ async def fetch_and_store_chapters(manga_id: int) -> list[Chapter]:
         existing_chapters = session.exec(
             select(Chapter).where(Chapter.manga_id == manga_id)
         ).all()
-
+        for chapter in existing_chapters:
+            session.expunge(chapter)
         if existing_chapters:
-            return list(existing_chapters)
+            sync.add(sort_chapters(existing_chapters))
 
-        if manga.source == "mangadex" and manga.mangadex_id:
-            async with MangaDexSource() as source:
-                chapter_metadata_list = await source.get_chapters(manga.mangadex_id)
+        if manga.chapters_complete or manga.source != "mangadex" or not manga.mangadex_id:
+            return
 
+        # An interrupted feed resumes here: chapters already stored (and maybe already opened) are kept.
+        known = {c.source_chapter_id for c in existing_chapters}
+        source = get_mangadex_source()
+        try:
+            async for metadata_batch in source.iter_chapters(manga.mangadex_id):
                 chapters = []
-                for meta in chapter_metadata_list:
+                for meta in metadata_batch:
+                    if meta.source_chapter_id in known:
+                        continue
+                    known.add(meta.source_chapter_id)
                     chapter = Chapter(
                         manga_id=manga_id,
                         chapter_number=meta.chapter_number,
@@ -37,6 +109,9 @@ async def fetch_and_store_chapters(manga_id: int) -> list[Chapter]:
                     )
                     chapters.append(chapter)
 
+                if not chapters:
+                    continue
+
                 for chapter in chapters:
                     session.add(chapter)
 
@@ -44,10 +119,22 @@ async def fetch_and_store_chapters(manga_id: int) -> list[Chapter]:
 
                 for chapter in chapters:
                     session.refresh(chapter)
+                    session.expunge(chapter)
 
-                return chapters
+                sync.add(chapters)
+        except BaseException:
+            session.rollback()
+            raise
 
-        return []
+        manga.chapters_complete = True
+        session.add(manga)
+        session.commit()
+
+async def fetch_and_store_chapters(manga_id: int) -> list[Chapter]:
+    chapters = []
+    async for batch in stream_chapters(manga_id):
+        chapters.extend(batch)
+    return sort_chapters(chapters)
 
 def get_manga_chapters(manga_id: int) -> list[Chapter]:
     with get_session() as session:
@@ -72,31 +159,31 @@ async def fetch_and_store_pages(chapter_id: int) -> list[Page]:
             return list(existing_pages)
 
         if chapter.source == "mangadex" and chapter.source_chapter_id:
-            async with MangaDexSource() as source:
-                page_info_list = await source.get_pages(chapter.source_chapter_id)
-
-                pages = []
-                for info in page_info_list:
-                    page = Page(
-                        chapter_id=chapter_id,
-                        page_number=info.page_number,
-                        remote_url=info.url,
-                        is_downloaded=False,
-                        is_cached=False,
-                    )
-                    pages.append(page)
+            source = get_mangadex_source()
+            page_info_list = await source.get_pages(chapter.source_chapter_id)
 
-                for page in pages:
-                    session.add(page)
+            pages = []
+            for info in page_info_list:
+                page = Page(
+                    chapter_id=chapter_id,
+                    page_number=info.page_number,
+                    remote_url=info.url,
+                    is_downloaded=False,
+                    is_cached=False,
+                )
+                pages.append(page)
 
-                chapter.page_count = len(pages)
+            for page in pages:
+                session.add(page)
 
-                session.commit()
+            chapter.page_count = len(pages)
+
+            session.commit()
 
-                for page in pages:
-                    session.refresh(page)
+            for page in pages:
+                session.refresh(page)
 
-                return pages
+            return pages
 
         return []
 
@@ -109,18 +196,26 @@ def get_chapter_pages(chapter_id: int) -> list[Page]:
         ).all()
         return list(pages)
 
+def get_next_chapter(chapter_id: int) -> Chapter | None:
+    with get_session() as session:
+        chapter = session.get(Chapter, chapter_id)
+        if not chapter:
+            return None
+        siblings = session.exec(
+            select(Chapter).where(
+                Chapter.manga_id == chapter.manga_id,
+                Chapter.source == chapter.source,
+            )
+        ).all()
+
+    current = _chapter_number_key(chapter)
+    later = [c for c in siblings if c.id != chapter.id and _chapter_number_key(c) > current]
+    if not later:
+        return None
+    return min(later, key=_chapter_number_key)
+
 def sync_fetch_chapters(manga_id: int) -> list[Chapter]:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(fetch_and_store_chapters(manga_id))
-    finally:
-        loop.close()
+    return get_mangadex_source().run_sync(fetch_and_store_chapters(manga_id))
 
 def sync_fetch_pages(chapter_id: int) -> list[Page]:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(fetch_and_store_pages(chapter_id))
-    finally:
-        loop.close()
+    return get_mangadex_source().run_sync(fetch_and_store_pages(chapter_id))
@@ -1,22 +1,36 @@
-import hashlib
+import shutil
+import time
 from pathlib import Path
 import requests
 
-COV_DIR = Path.home() / ".cache" / "mangareader" / "anilist_covers"
-COV_DIR.mkdir(parents=True, exist_ok=True)
+from app.cache import ImageCache, get_image_cache
+from app.core.config import CACHE_ROOT
 
-def cover_path_for_url(url: str) -> Path:
-    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
-    return COV_DIR / f"{h}.jpg"
+# Covers used to be kept here with no size limit; they now live in the "covers" cache namespace.
+LEGACY_COV_DIR = CACHE_ROOT / "anilist_covers"
+LEGACY_COVERS_MIGRATED = "legacy_anilist_covers_removed"
+
+def migrate_legacy_covers(cache: ImageCache | None = None, legacy_dir: Path = LEGACY_COV_DIR) -> bool:
+    cache = cache or get_image_cache("covers")
+    if cache.get_meta(LEGACY_COVERS_MIGRATED) is not None:
+        return False
+    # The old files are named by a hash of their URL and cannot be re-keyed, so they are dropped once.
+    shutil.rmtree(legacy_dir, ignore_errors=True)
+    cache.set_meta(LEGACY_COVERS_MIGRATED, str(time.time()))
+    return True
+
+def cover_path_for_url(url: str) -> Path | None:
+    return get_image_cache("covers").get_path(url)
 
 def ensure_cover(url: str) -> Path | None:
     p = cover_path_for_url(url)
-    if p.exists():
+    if p:
         return p
     try:
         r = requests.get(url, timeout=20)
         r.raise_for_status()
-        p.write_bytes(r.content)
-        return p
+        cache = get_image_cache("covers")
+        cache.put_bytes(url, r.content)
+        return cache.get_path(url)
     except Exception:
         return None
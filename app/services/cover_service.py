@@ -1,14 +1,29 @@
-from pathlib import Path
 import hashlib
+from io import BytesIO
+from pathlib import Path
 from PIL import Image
 
+from app.cache import get_image_cache
+
 IMG_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
-COVER_DIR = Path("data/covers")
+LEGACY_COVER_DIR = Path("data/covers")
 
-def cover_path_for_manga_dir(manga_dir: Path) -> Path:
-    COVER_DIR.mkdir(parents=True, exist_ok=True)
+def _cover_key(manga_dir: Path) -> str:
+    return f"local:{manga_dir}"
+
+def _import_legacy_cover(manga_dir: Path) -> Path | None:
     h = hashlib.sha1(str(manga_dir).encode("utf-8")).hexdigest()
-    return COVER_DIR / f"{h}.jpg"
+    legacy = LEGACY_COVER_DIR / f"{h}.jpg"
+    if not legacy.exists():
+        return None
+    cache = get_image_cache("covers")
+    cache.put_bytes(_cover_key(manga_dir), legacy.read_bytes())
+    legacy.unlink()
+    return cache.get_path(_cover_key(manga_dir))
+
+def cover_path_for_manga_dir(manga_dir: Path) -> Path | None:
+    p = get_image_cache("covers").get_path(_cover_key(manga_dir))
+    return p or _import_legacy_cover(manga_dir)
 
 def find_first_image_in_tree(chapter_dir: Path) -> Path | None:
     for p in sorted(chapter_dir.rglob("*"), key=lambda x: x.name.lower()):
@@ -17,8 +32,7 @@ def find_first_image_in_tree(chapter_dir: Path) -> Path | None:
     return None
 
 def build_cover(manga_dir: Path, first_chapter_name: str) -> Path | None:
-    out = cover_path_for_manga_dir(manga_dir)
-    if out.exists():
+    if cover_path_for_manga_dir(manga_dir):
         return None
 
     chapter_dir = manga_dir / first_chapter_name
@@ -31,5 +45,8 @@ def build_cover(manga_dir: Path, first_chapter_name: str) -> Path | None:
 
     img = Image.open(img_path).convert("RGB")
     img.thumbnail((600, 900))
-    img.save(out, "JPEG", quality=85, optimize=True)
-    return out
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=85, optimize=True)
+    cache = get_image_cache("covers")
+    cache.put_bytes(_cover_key(manga_dir), buf.getvalue())
+    return cache.get_path(_cover_key(manga_dir))
@@ -0,0 +1,64 @@
+from pathlib import Path
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from app.cache import get_image_cache
+from app.services.cover_dl_service import ensure_cover
+
+CARD_COVER_SIZE = QSize(160, 220)
+
+def _thumb_key(url: str) -> str:
+    return f"thumb:{url}"
+
+def cover_crop(image: QImage, size: QSize) -> QImage:
+    if image.size() != size:
+        image = image.scaled(size, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    x = max(0, (image.width() - size.width()) // 2)
+    y = max(0, (image.height() - size.height()) // 2)
+    return image.copy(x, y, size.width(), size.height())
+
+def _read_scaled(path: Path, size: QSize) -> QImage:
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    source = reader.size()
+    if source.isValid():
+        # Let the JPEG decoder downsample while decoding instead of materialising the full cover.
+        reader.setScaledSize(source.scaled(size, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+    return reader.read()
+
+def _stored_thumbnail(key: str, size: QSize) -> QImage | None:
+    data = get_image_cache("covers").get_bytes(_thumb_key(key), size)
+    if data:
+        image = QImage.fromData(QByteArray(data))
+        if not image.isNull():
+            return image
+    return None
+
+def _make_thumbnail(key: str, path: Path | None, size: QSize) -> QImage | None:
+    if not path:
+        return None
+    image = _read_scaled(path, size)
+    if image.isNull():
+        return None
+    thumb = cover_crop(image, size)
+
+    encoded = QByteArray()
+    buffer = QBuffer(encoded)
+    buffer.open(QIODevice.WriteOnly)
+    thumb.save(buffer, "JPEG", 90)
+    get_image_cache("covers").put_bytes(_thumb_key(key), bytes(encoded), size)
+    return thumb
+
+def load_cover_thumbnail(url: str, size: QSize = CARD_COVER_SIZE) -> QImage | None:
+    return _stored_thumbnail(url, size) or _make_thumbnail(url, ensure_cover(url), size)
+
+def load_file_thumbnail(path: Path, size: QSize = CARD_COVER_SIZE) -> QImage | None:
+    return _stored_thumbnail(str(path), size) or _make_thumbnail(str(path), path, size)
+
+def cached_cover_thumbnail(url: str, size: QSize = CARD_COVER_SIZE) -> QPixmap | None:
+    return get_image_cache("covers").get_memory(_thumb_key(url), size)
+
+def remember_cover_thumbnail(url: str, image: QImage, size: QSize = CARD_COVER_SIZE) -> QPixmap:
+    pixmap = QPixmap.fromImage(image)
+    get_image_cache("covers").put(_thumb_key(url), pixmap, size, save_to_disk=False)
+    return pixmap
@@ -0,0 +1,80 @@
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPixmap
+
+from app.cache import ImageCache
+from app.services.image_decoder import ImageDecoder
+
+
+class DisplayScaler:
+    MAX_TRACKED_PAGES = 256
+    SIZES_PER_PAGE = 4
+    # In fit-height mode, pages narrower than this share of the viewport are fitted to width instead.
+    NARROW_PAGE_RATIO = 0.65
+
+    def __init__(self, image_cache: ImageCache, decoder: ImageDecoder):
+        self.image_cache = image_cache
+        self.decoder = decoder
+        self._sizes: OrderedDict[str, list[QSize]] = OrderedDict()
+        self._pending: dict[tuple[str, int, int], asyncio.Future] = {}
+
+    @classmethod
+    def target_size(cls, image_size: QSize, viewport: QSize, fit_mode: str) -> QSize:
+        ow, oh = max(1, image_size.width()), max(1, image_size.height())
+        vw, vh = max(1, viewport.width()), max(1, viewport.height())
+
+        if fit_mode == "height" and vh / oh * ow >= vw * cls.NARROW_PAGE_RATIO:
+            return QSize(max(1, round(ow * vh / oh)), vh)
+        return QSize(vw, max(1, round(oh * vw / ow)))
+
+    @staticmethod
+    def physical_size(size: QSize, dpr: float) -> QSize:
+        return QSize(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)))
+
+    def cached(self, cache_id: str, size: QSize, dpr: float = 1.0) -> Optional[QPixmap]:
+        return self.image_cache.get(cache_id, self.physical_size(size, dpr))
+
+    def nearest(self, cache_id: str, size: QSize, dpr: float = 1.0) -> Optional[QPixmap]:
+        size = self.physical_size(size, dpr)
+
+        def distance(s: QSize) -> int:
+            return abs(s.width() - size.width()) + abs(s.height() - size.height())
+
+        for known in sorted(self._sizes.get(cache_id, []), key=distance):
+            pixmap = self.image_cache.get(cache_id, known)
+            if pixmap:
+                return pixmap
+        return None
+
+    async def scaled(self, cache_id: str, image: QImage, size: QSize, dpr: float = 1.0) -> QPixmap:
+        # Scale to device pixels so HiDPI screens are sharp and the cache counts the real pixel size.
+        size = self.physical_size(size, dpr)
+        cached = self.image_cache.get(cache_id, size)
+        if cached:
+            return cached
+
+        key = (cache_id, size.width(), size.height())
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self.decoder.scale(image, size))
+            task.add_done_callback(lambda _, k=key: self._pending.pop(k, None))
+        scaled = await asyncio.shield(task)
+
+        cached = self.image_cache.get(cache_id, size)
+        if cached:
+            return cached
+        pixmap = QPixmap.fromImage(scaled)
+        pixmap.setDevicePixelRatio(dpr)
+        self.image_cache.put(cache_id, pixmap, size, save_to_disk=False)
+        self._remember(cache_id, size)
+        return pixmap
+
+    def _remember(self, cache_id: str, size: QSize):
+        sizes = self._sizes.pop(cache_id, [])
+        sizes = [s for s in sizes if s != size][-(self.SIZES_PER_PAGE - 1):] + [size]
+        self._sizes[cache_id] = sizes
+        while len(self._sizes) > self.MAX_TRACKED_PAGES:
+            self._sizes.popitem(last=False)
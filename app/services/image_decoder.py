@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+from PIL.ImageQt import ImageQt
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader
+
+from app.core.config import DECODE_WORKERS
+
+
+def _read(reader: QImageReader) -> QImage:
+    reader.setAutoTransform(True)
+    return reader.read()
+
+
+def _decode_with_pil(source) -> QImage:
+    with Image.open(source) as img:
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        # ImageQt borrows the PIL buffer, so detach it before the PIL image is released.
+        return ImageQt(img).copy()
+
+
+def decode_bytes(data: bytes) -> QImage:
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    image = _read(QImageReader(buffer))
+    if not image.isNull():
+        return image
+    try:
+        return _decode_with_pil(BytesIO(data))
+    except Exception:
+        raise ValueError("Unsupported or corrupt image data")
+
+
+def decode_file(path: Path) -> QImage:
+    image = _read(QImageReader(str(path)))
+    if not image.isNull():
+        return image
+    # Fall back to PIL only for formats Qt has no image plugin for.
+    return _decode_with_pil(path)
+
+
+def scale_image(image: QImage, size: QSize) -> QImage:
+    return image.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+
+class ImageDecoder:
+    def __init__(self, workers: int = DECODE_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode")
+
+    async def decode_bytes(self, data: bytes) -> QImage:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, decode_bytes, data)
+
+    async def decode_file(self, path: Path) -> QImage:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, decode_file, path)
+
+    async def scale(self, image: QImage, size: QSize) -> QImage:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, scale_image, image, size)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_global_decoder: Optional[ImageDecoder] = None
+
+
+def get_image_decoder() -> ImageDecoder:
+    global _global_decoder
+    if _global_decoder is None:
+        _global_decoder = ImageDecoder()
+    return _global_decoder
@@ -3,74 +3,164 @@ from pathlib import Path
 from typing import Optional
 from PIL import Image
 from io import BytesIO
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import QByteArray
+from PySide6.QtGui import QImage
 
 from app.models import Chapter, Page
 from app.sources.base import MangaSource
-from app.sources.mangadex import MangaDexSource
+from app.sources.mangadex import get_mangadex_source
 from app.cache import get_image_cache
+from app.services.image_decoder import get_image_decoder
+
+
+DATA_SAVER_SUFFIX = "#data-saver"
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
 
 
 class PageLoader:
     def __init__(self):
         self.image_cache = get_image_cache()
         self._sources: dict[str, MangaSource] = {
-            "mangadex": MangaDexSource()
+            "mangadex": get_mangadex_source()
         }
         self._prefetch_tasks: dict[str, asyncio.Task] = {}
+        self._inflight: dict[str, _Flight] = {}
+        # The source records every page download; read-ahead sizing reads the same meter.
+        self.bandwidth = self._sources["mangadex"].bandwidth
+        self.decoder = get_image_decoder()
 
     def get_source(self, source_name: str) -> Optional[MangaSource]:
 
         return self._sources.get(source_name)
 
-    async def load_page_bytes(self, chapter: Chapter, page: Page) -> bytes:
+    async def load_page_bytes(self, chapter: Chapter, page: Page, data_saver: bool = False) -> bytes:
         if page.local_path and Path(page.local_path).exists():
             return Path(page.local_path).read_bytes()
 
         if page.remote_url:
             source = self.get_source(chapter.source)
             if source:
-                return await source.download_image(page.remote_url)
+                return await source.download_page(chapter.source_chapter_id, page.remote_url, data_saver=data_saver)
 
         raise ValueError(f"No valid source for page {page.page_number} in chapter {chapter.id}")
 
-    async def load_page_pixmap(self, chapter: Chapter, page: Page) -> QPixmap:
-        cache_id = page.local_path if page.local_path else page.remote_url
+    def data_saver(self) -> bool:
+        return any(source.use_data_saver() for source in self._sources.values())
+
+    def cache_id(self, page: Page) -> Optional[str]:
+        if page.local_path:
+            return page.local_path
+        if page.remote_url and self.data_saver():
+            # Low-quality pages get their own key so full quality is fetched again once bandwidth recovers.
+            return page.remote_url + DATA_SAVER_SUFFIX
+        return page.remote_url
+
+    def get_cached_image(self, page: Page, cache_id: Optional[str] = None) -> Optional[QImage]:
+        cache_id = cache_id or self.cache_id(page)
+        if not cache_id:
+            return None
+        return self.image_cache.get_memory(cache_id)
+
+    async def load_page_image(self, chapter: Chapter, page: Page, cache_id: Optional[str] = None) -> QImage:
+        cache_id = cache_id or self.cache_id(page)
         if not cache_id:
             raise ValueError(f"Page {page.page_number} has no valid identifier")
-        cached_pixmap = self.image_cache.get(cache_id)
-        if cached_pixmap:
-            return cached_pixmap
-
-        image_bytes = await self.load_page_bytes(chapter, page)
-        pixmap = QPixmap()
-        pixmap.loadFromData(QByteArray(image_bytes))
-        if pixmap.isNull():
-            raise ValueError(f"Failed to load image for page {page.page_number}")
-        self.image_cache.put(cache_id, pixmap, save_to_disk=True)
-        return pixmap
+        return await self._load_once(cache_id, lambda: self._load_and_cache(chapter, page, cache_id))
+
+    def get_cached_file_image(self, path: Path) -> Optional[QImage]:
+        return self.image_cache.get_memory(str(path))
+
+    async def load_file_image(self, path: Path) -> QImage:
+        return await self._load_once(str(path), lambda: self._load_file_and_cache(path))
+
+    async def _load_once(self, cache_id: str, load) -> QImage:
+        # Memory only, and uncounted: callers count their own lookups; disk hits are decoded by the load itself.
+        cached_image = self.image_cache.get_memory(cache_id, count=False)
+        if cached_image:
+            return cached_image
 
-    async def prefetch_pages(self, chapter: Chapter, pages: list[Page], current_index: int, window: int = 2):
-        start_idx = max(0, current_index - window)
-        end_idx = min(len(pages), current_index + window + 1)
+        flight = self._inflight.get(cache_id)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(load()))
+            self._inflight[cache_id] = flight
+            flight.task.add_done_callback(lambda _, key=cache_id, f=flight: self._land(key, f))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # Only abort the shared download once nobody is waiting for it any more.
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+                self._land(cache_id, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _land(self, cache_id: str, flight: _Flight):
+        if self._inflight.get(cache_id) is flight:
+            del self._inflight[cache_id]
+        if flight.task.done() and not flight.task.cancelled():
+            flight.task.exception()
+
+    def is_loading(self, page: Page) -> bool:
+        cache_id = self.cache_id(page)
+        return cache_id is not None and cache_id in self._inflight
+
+    async def _load_and_cache(self, chapter: Chapter, page: Page, cache_id: str) -> QImage:
+        image_bytes = None
+        data_saver = cache_id.endswith(DATA_SAVER_SUFFIX)
+        if not page.local_path:
+            # A full-quality copy on disk beats the low-quality one, even in data-saver mode.
+            for disk_id in ([page.remote_url, cache_id] if data_saver else [cache_id]):
+                image_bytes = await asyncio.to_thread(self.image_cache.get_bytes, disk_id)
+                if image_bytes is not None:
+                    break
+        from_disk = image_bytes is not None
+        if image_bytes is None:
+            image_bytes = await self.load_page_bytes(chapter, page, data_saver)
+        try:
+            image = await self.decoder.decode_bytes(image_bytes)
+        except ValueError:
+            raise ValueError(f"Failed to load image for page {page.page_number}")
+        self.image_cache.put(cache_id, image, save_to_disk=False)
+        if not page.local_path and not from_disk:
+            self.image_cache.put_bytes(cache_id, image_bytes)
+        return image
+
+    async def _load_file_and_cache(self, path: Path) -> QImage:
+        image = await self.decoder.decode_file(path)
+        self.image_cache.put(str(path), image, save_to_disk=False)
+        return image
+
+    async def prefetch_pages(self, chapter: Chapter, pages: list[Page], current_index: int, window: int = 2,
+                             indices: Optional[list[int]] = None):
+        if indices is None:
+            start_idx = max(0, current_index - window)
+            end_idx = min(len(pages), current_index + window + 1)
+            indices = list(range(start_idx, end_idx))
+        wanted = {f"{chapter.id}_{i}" for i in indices}
         for key in list(self._prefetch_tasks.keys()):
-            if key not in [f"{chapter.id}_{i}" for i in range(start_idx, end_idx)]:
+            if key not in wanted:
                 task = self._prefetch_tasks.pop(key)
                 if not task.done():
                     task.cancel()
 
 
-        for idx in range(start_idx, end_idx):
-            if idx == current_index:
+        for idx in indices:
+            if idx == current_index or not 0 <= idx < len(pages):
                 continue  
             page = pages[idx]
             task_key = f"{chapter.id}_{idx}"
-            if task_key in self._prefetch_tasks:
+            if task_key in self._prefetch_tasks and not self._prefetch_tasks[task_key].done():
                 continue
 
-            cache_id = page.local_path if page.local_path else page.remote_url
-            if cache_id and self.image_cache.has(cache_id):
+            cache_id = self.cache_id(page)
+            if cache_id and (cache_id in self._inflight or self.image_cache.has(cache_id)):
                 continue
 
             task = asyncio.create_task(self._prefetch_page(chapter, page))
@@ -78,7 +168,7 @@ class PageLoader:
 
     async def _prefetch_page(self, chapter: Chapter, page: Page):
         try:
-            await self.load_page_pixmap(chapter, page)
+            await self.load_page_image(chapter, page)
         except Exception as e:
 
             print(f"Prefetch failed for page {page.page_number}: {e}")
@@ -91,6 +181,7 @@ class PageLoader:
 
     async def close(self):
         self.cancel_prefetch()
+        self.decoder.shutdown()
         for source in self._sources.values():
             if hasattr(source, 'close'):
                 await source.close()
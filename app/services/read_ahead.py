@@ -0,0 +1,132 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.config import NEXT_CHAPTER_PREFETCH_AT, NEXT_CHAPTER_PREFETCH_PAGES
+from app.models import Chapter, Page
+from app.services.chapter_service import fetch_and_store_pages, get_next_chapter
+
+
+class ReadAheadScheduler:
+    MIN_AHEAD = 2
+    MAX_AHEAD = 12
+    MAX_BEHIND = 2
+    BEHIND_WEIGHT = 3.0
+    SAFETY = 1.5
+    TURN_HISTORY = 6
+    MAX_TURN_STEP = 3
+    IDLE_TURN_SECONDS = 30.0
+    DEFAULT_FETCH_SECONDS = 1.0
+    NEXT_CHAPTER_RETRY_SECONDS = 10.0
+
+    def __init__(self, page_loader, min_ahead: int = MIN_AHEAD, max_ahead: int = MAX_AHEAD, max_behind: int = MAX_BEHIND,
+                 next_chapter_at: float = NEXT_CHAPTER_PREFETCH_AT, next_chapter_pages: int = NEXT_CHAPTER_PREFETCH_PAGES):
+        self.page_loader = page_loader
+        self.min_ahead = min_ahead
+        self.max_ahead = max_ahead
+        self.max_behind = max_behind
+        self.next_chapter_at = next_chapter_at
+        self.next_chapter_pages = next_chapter_pages
+        self._turns: deque[tuple[float, int]] = deque(maxlen=self.TURN_HISTORY)
+        self._next_chapter_tasks: dict[int, asyncio.Task] = {}
+        self._warmed: set[int] = set()
+        self._retry_at: dict[int, float] = {}
+
+    def reset(self):
+        self._turns.clear()
+
+    def record_turn(self, index: int, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        if self._turns and self._turns[-1][1] == index:
+            return
+        if self._turns:
+            last_time, last_index = self._turns[-1]
+            if now - last_time > self.IDLE_TURN_SECONDS or abs(index - last_index) > self.MAX_TURN_STEP:
+                self._turns.clear()
+        self._turns.append((now, index))
+
+    def turn_interval(self) -> Optional[float]:
+        if len(self._turns) < 2:
+            return None
+        turns = list(self._turns)
+        steps = sum(abs(b[1] - a[1]) for a, b in zip(turns, turns[1:]))
+        if steps <= 0:
+            return None
+        return max(turns[-1][0] - turns[0][0], 1e-3) / steps
+
+    def heading(self) -> int:
+        if len(self._turns) < 2:
+            return 1
+        return -1 if self._turns[-1][1] < self._turns[0][1] else 1
+
+    def window(self) -> tuple[int, int]:
+        fetch = self.page_loader.bandwidth.estimate_fetch_seconds() or self.DEFAULT_FETCH_SECONDS
+        interval = self.turn_interval()
+        if interval is None:
+            ahead = self.min_ahead
+        else:
+            ahead = math.ceil(fetch / interval * self.SAFETY) + 1
+        ahead = min(max(ahead, self.min_ahead), self.max_ahead)
+        behind = min(self.max_behind, max(1, ahead // 4))
+        return ahead, behind
+
+    def plan(self, index: int, total: int) -> list[int]:
+        ahead, behind = self.window()
+        step = self.heading()
+        scored: list[tuple[float, int]] = []
+        for d in range(1, ahead + 1):
+            i = index + step * d
+            if 0 <= i < total:
+                scored.append((float(d), i))
+        for d in range(1, behind + 1):
+            i = index - step * d
+            if 0 <= i < total:
+                scored.append((d * self.BEHIND_WEIGHT, i))
+        scored.sort()
+        return [i for _, i in scored]
+
+    def schedule(self, chapter: Chapter, pages: list[Page], index: int):
+        if not pages:
+            return
+        self.record_turn(index)
+        indices = self.plan(index, len(pages))
+        asyncio.ensure_future(self.page_loader.prefetch_pages(chapter, pages, index, indices=indices))
+        if (index + 1) >= len(pages) * self.next_chapter_at:
+            self.prefetch_next_chapter(chapter)
+
+    def prefetch_next_chapter(self, chapter: Chapter):
+        if chapter.id is None or chapter.id in self._next_chapter_tasks or chapter.id in self._warmed:
+            return
+        if time.monotonic() < self._retry_at.get(chapter.id, 0.0):
+            return
+        task = asyncio.ensure_future(self._warm_next_chapter(chapter))
+        self._next_chapter_tasks[chapter.id] = task
+        task.add_done_callback(lambda t, chapter_id=chapter.id: self._warm_done(chapter_id, t))
+
+    def _warm_done(self, chapter_id: int, task: asyncio.Task):
+        if self._next_chapter_tasks.get(chapter_id) is task:
+            del self._next_chapter_tasks[chapter_id]
+        if task.cancelled():
+            return
+        # A failed warm-up is retried later; the reader reports the error if the chapter is opened.
+        if task.exception() is None:
+            self._warmed.add(chapter_id)
+            self._retry_at.pop(chapter_id, None)
+        else:
+            self._retry_at[chapter_id] = time.monotonic() + self.NEXT_CHAPTER_RETRY_SECONDS
+
+    async def _warm_next_chapter(self, chapter: Chapter):
+        nxt = get_next_chapter(chapter.id)
+        if not nxt:
+            return
+        pages = await fetch_and_store_pages(nxt.id)
+        for page in pages[:self.next_chapter_pages]:
+            await self.page_loader.load_page_image(nxt, page)
+
+    def cancel(self):
+        for task in self._next_chapter_tasks.values():
+            if not task.done():
+                task.cancel()
+        self._next_chapter_tasks.clear()
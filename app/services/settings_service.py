@@ -1,4 +1,5 @@
 from sqlmodel import select
+from app.core.config import DISK_CACHE_MB, MEMORY_CACHE_MB
 from app.db.session import get_session
 from app.models.settings import Settings
 
@@ -15,3 +16,20 @@ def set_library_root(path: str):
         else:
             session.add(Settings(id=1, library_root=path))
         session.commit()
+
+def get_cache_limits() -> tuple[int, int]:
+    with get_session() as session:
+        row = session.exec(select(Settings).where(Settings.id == 1)).first()
+        if not row:
+            return MEMORY_CACHE_MB, DISK_CACHE_MB
+        return row.memory_cache_mb, row.disk_cache_mb
+
+def set_cache_limits(memory_mb: int, disk_mb: int) -> bool:
+    with get_session() as session:
+        row = session.exec(select(Settings).where(Settings.id == 1)).first()
+        if not row:
+            return False
+        row.memory_cache_mb = memory_mb
+        row.disk_cache_mb = disk_mb
+        session.commit()
+        return True
@@ -0,0 +1,94 @@
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+from app.core.bandwidth import BandwidthMeter
+from app.core.config import DATA_SAVER_BELOW_KBPS
+
+QUALITIES = ("auto", "data", "data-saver")
+
+
+@dataclass
+class AtHomeServer:
+    chapter_id: str
+    base_url: str
+    chapter_hash: str
+    data: list[str]
+    data_saver: list[str]
+    fetched_at: float = field(default_factory=time.monotonic)
+    failures: int = 0
+
+    def page_url(self, index: int, data_saver: bool = False) -> str:
+        if data_saver and index < len(self.data_saver):
+            return f"{self.base_url}/data-saver/{self.chapter_hash}/{self.data_saver[index]}"
+        return f"{self.base_url}/data/{self.chapter_hash}/{self.data[index]}"
+
+
+class AtHomeResolver:
+    TOKEN_TTL = 12 * 60
+    MAX_NODE_FAILURES = 2
+
+    def __init__(self,
+                 fetch_server: Callable[[str], Awaitable[dict]],
+                 bandwidth: BandwidthMeter,
+                 quality: str = "auto",
+                 data_saver_below_bps: float = DATA_SAVER_BELOW_KBPS * 1024):
+        if quality not in QUALITIES:
+            raise ValueError(f"Unknown page quality {quality!r}, expected one of {QUALITIES}")
+        self._fetch_server = fetch_server
+        self.bandwidth = bandwidth
+        self.quality = quality
+        self.data_saver_below_bps = data_saver_below_bps
+        self._servers: dict[str, AtHomeServer] = {}
+
+    async def server(self, chapter_id: str, refresh: bool = False) -> AtHomeServer:
+        cached = self._servers.get(chapter_id)
+        if cached and not refresh and time.monotonic() - cached.fetched_at < self.TOKEN_TTL:
+            return cached
+
+        data = await self._fetch_server(chapter_id)
+        server = AtHomeServer(
+            chapter_id=chapter_id,
+            base_url=data["baseUrl"],
+            chapter_hash=data["chapter"]["hash"],
+            data=list(data["chapter"]["data"]),
+            data_saver=list(data["chapter"].get("dataSaver") or []),
+        )
+        self._servers[chapter_id] = server
+        return server
+
+    def use_data_saver(self) -> bool:
+        if self.quality != "auto":
+            return self.quality == "data-saver"
+        bps = self.bandwidth.bytes_per_sec
+        return bps is not None and bps < self.data_saver_below_bps
+
+    async def resolve(self, chapter_id: str, url: str, data_saver: Optional[bool] = None) -> str:
+        parts = urlparse(url).path.strip("/").split("/")
+        if len(parts) < 3 or parts[-3] not in ("data", "data-saver"):
+            return url
+        chapter_hash, filename = parts[-2], parts[-1]
+
+        server = await self.server(chapter_id)
+        if server.chapter_hash != chapter_hash:
+            return url
+        names = server.data_saver if parts[-3] == "data-saver" else server.data
+        if filename not in names:
+            return url
+        if data_saver is None:
+            data_saver = self.use_data_saver()
+        return server.page_url(names.index(filename), data_saver)
+
+    def report_failure(self, chapter_id: str, expired: bool = False):
+        server = self._servers.get(chapter_id)
+        if not server:
+            return
+        server.failures += 1
+        if expired or server.failures >= self.MAX_NODE_FAILURES:
+            self._servers.pop(chapter_id, None)
+
+    def report_success(self, chapter_id: str):
+        server = self._servers.get(chapter_id)
+        if server:
+            server.failures = 0
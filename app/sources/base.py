@@ -73,3 +73,9 @@ class MangaSource(ABC):
     @abstractmethod
     async def download_image(self, url: str) -> bytes:
         pass
+
+    def use_data_saver(self) -> bool:
+        return False
+
+    async def download_page(self, chapter_id: str, url: str, data_saver: bool = False) -> bytes:
+        return await self.download_image(url)
@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .rate_limit import TokenBucket, retry_after_seconds
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    timeout: float = 20.0
+    connect_timeout: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        # Half-open lets exactly one probe through; everyone else waits for its verdict.
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def end_probe(self):
+        self.probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.probing = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.counters: Counter = Counter()
+        self.listeners: list[Callable[[str, str, str], None]] = []
+
+    def emit(self, event: str, host: str, reason: str = ""):
+        self.counters[event] += 1
+        if reason:
+            self.counters[f"{event}:{reason}"] += 1
+        for listener in self.listeners:
+            listener(event, host, reason)
+
+    def snapshot(self) -> dict:
+        return dict(self.counters)
+
+
+class ResilientHttp:
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    RETRY_EXCEPTIONS = (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+    def __init__(self,
+                 get_session: Callable[[], Awaitable[aiohttp.ClientSession]],
+                 policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[RequestMetrics] = None,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        self._get_session = get_session
+        self.policy = policy or RetryPolicy()
+        self.metrics = metrics or RequestMetrics()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self._breakers[host]
+
+    async def get_json(self, url: str, params: Optional[dict] = None, bucket: Optional[TokenBucket] = None,
+                       attempts: Optional[int] = None) -> Any:
+        return await self._request(url, params, bucket, lambda r: r.json(), attempts)
+
+    async def get_bytes(self, url: str, bucket: Optional[TokenBucket] = None, attempts: Optional[int] = None) -> bytes:
+        return await self._request(url, None, bucket, lambda r: r.read(), attempts)
+
+    async def get_bytes_timed(self, url: str, bucket: Optional[TokenBucket] = None,
+                              attempts: Optional[int] = None) -> tuple[bytes, float]:
+        async def read(response: aiohttp.ClientResponse):
+            started = time.monotonic()
+            data = await response.read()
+            return data, time.monotonic() - started
+        return await self._request(url, None, bucket, read, attempts)
+
+    async def _request(self, url: str, params: Optional[dict], bucket: Optional[TokenBucket],
+                       read: Callable[[aiohttp.ClientResponse], Awaitable[Any]], attempts: Optional[int] = None) -> Any:
+        host = urlparse(url).netloc
+        breaker = self.breaker(host)
+        timeout = aiohttp.ClientTimeout(total=self.policy.timeout, sock_connect=self.policy.connect_timeout)
+        attempts = attempts or self.policy.attempts
+        last_attempt = attempts - 1
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                self.metrics.emit("rejected", host, "circuit_open")
+                raise CircuitOpenError(host, breaker.retry_in())
+            if bucket is not None:
+                await bucket.acquire()
+
+            self.metrics.emit("request", host)
+            session = await self._get_session()
+            try:
+                async with session.get(url, params=params, timeout=timeout) as response:
+                    if bucket is not None:
+                        bucket.update_from_headers(response.headers)
+
+                    if response.status in self.RETRY_STATUSES:
+                        if response.status != 429:
+                            breaker.record_failure()
+                        if attempt == last_attempt:
+                            self.metrics.emit("failure", host, str(response.status))
+                            response.raise_for_status()
+                        delay = self.policy.backoff(attempt)
+                        if response.status == 429:
+                            retry_after = retry_after_seconds(response.headers)
+                            if retry_after is not None:
+                                # Honour the whole ban; retrying inside it only earns more 429s.
+                                if bucket is not None:
+                                    bucket.block_for(retry_after)
+                                if retry_after > self.policy.max_delay:
+                                    self.metrics.emit("failure", host, "429")
+                                    response.raise_for_status()
+                                delay = retry_after
+                        self.metrics.emit("retry", host, str(response.status))
+                        await asyncio.sleep(delay)
+                        continue
+
+                    response.raise_for_status()
+                    result = await read(response)
+            except self.RETRY_EXCEPTIONS as e:
+                breaker.record_failure()
+                reason = type(e).__name__
+                if attempt == last_attempt:
+                    self.metrics.emit("failure", host, reason)
+                    raise
+                self.metrics.emit("retry", host, reason)
+                await asyncio.sleep(self.policy.backoff(attempt))
+                continue
+            finally:
+                # Attempts that end without a verdict (4xx, 429, cancellation) must not hold the probe slot.
+                breaker.end_probe()
+
+            breaker.record_success()
+            return result
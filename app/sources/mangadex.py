@@ -1,47 +1,138 @@
 import aiohttp
 import asyncio
-from typing import Optional
+import concurrent.futures
+import time
+from typing import Any, AsyncIterator, Coroutine, Optional, TypeVar
 from datetime import datetime
+from urllib.parse import urlparse
 from .base import MangaSource, MangaMetadata, ChapterMetadata, PageInfo
+from .rate_limit import TokenBucket
+from .http import ResilientHttp, RetryPolicy, RequestMetrics, CircuitOpenError
+from .at_home import AtHomeResolver
+from app.core.response_cache import ResponseCache, get_response_cache
+from app.core.bandwidth import BandwidthMeter
+from app.core.cancel import CancelToken, OperationCancelled, watch
+from app.core.config import PAGE_QUALITY
 
+T = TypeVar("T")
 
 class MangaDexSource(MangaSource):
     BASE_URL = "https://api.mangadex.org"
     CDN_URL = "https://uploads.mangadex.org"
-    REQUEST_DELAY = 0.2  
-    def __init__(self):
+    API_RATE = 5.0
+    API_BURST = 5
+    CDN_RATE = 20.0
+    CDN_BURST = 20
+    CHAPTER_PAGE_LIMIT = 100
+    MAX_FEED_OFFSET = 10000
+    PAGE_ATTEMPTS = 2
+    NODE_SWITCHES = 2
+    SLOW_PAGE_SECONDS = 8.0
+    CONNECTOR_LIMIT = 32
+    CONNECTOR_LIMIT_PER_HOST = 8
+    DNS_CACHE_TTL = 300
+    KEEPALIVE_TIMEOUT = 60
+    def __init__(self,
+                 base_url: str = BASE_URL,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 connector_limit: int = CONNECTOR_LIMIT,
+                 limit_per_host: int = CONNECTOR_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DNS_CACHE_TTL,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+                 api_rate: float = API_RATE,
+                 api_burst: int = API_BURST,
+                 cdn_rate: float = CDN_RATE,
+                 cdn_burst: int = CDN_BURST,
+                 page_quality: str = PAGE_QUALITY,
+                 response_cache: Optional[ResponseCache] = None):
+        self.base_url = base_url
+        self._responses = response_cache
+        self.connector_limit = connector_limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
         self._session: Optional[aiohttp.ClientSession] = None
-        self._last_request_time = 0
-        self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._api_bucket = TokenBucket(api_rate, api_burst)
+        self._cdn_bucket = TokenBucket(cdn_rate, cdn_burst)
+        self.metrics = RequestMetrics()
+        self._http = ResilientHttp(self._get_session, retry_policy, self.metrics)
+        self.bandwidth = BandwidthMeter()
+        self.at_home = AtHomeResolver(
+            self._fetch_at_home_server,
+            self.bandwidth,
+            quality=page_quality,
+        )
 
     @property
     def source_name(self) -> str:
         return "mangadex"
 
+    @property
+    def responses(self) -> ResponseCache:
+        if self._responses is None:
+            self._responses = get_response_cache()
+        return self._responses
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=self.connector_limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
         return self._session
 
-    async def _rate_limit(self):
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request_time
-            if elapsed < self.REQUEST_DELAY:
-                await asyncio.sleep(self.REQUEST_DELAY - elapsed)
-            self._last_request_time = asyncio.get_event_loop().time()
+    def run_sync(self, coro: Coroutine[Any, Any, T], cancel: Optional[CancelToken] = None) -> T:
+        if cancel is not None and cancel.cancelled:
+            coro.close()
+            raise OperationCancelled()
+
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                coro.close()
+                raise RuntimeError("run_sync() called on the source's own event loop; await the coroutine instead")
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+            # Cancelling the concurrent future cancels the task on the shared loop, aborting its HTTP request.
+            with watch(cancel, future.cancel):
+                try:
+                    return future.result()
+                except concurrent.futures.CancelledError:
+                    raise OperationCancelled()
+
+        loop = asyncio.new_event_loop()
+        try:
+            task = loop.create_task(coro)
+            with watch(cancel, lambda: loop.call_soon_threadsafe(task.cancel)):
+                try:
+                    return loop.run_until_complete(task)
+                except asyncio.CancelledError:
+                    raise OperationCancelled()
+        finally:
+            loop.run_until_complete(self.close())
+            loop.close()
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        if urlparse(url).netloc == urlparse(self.base_url).netloc:
+            return self._api_bucket
+        return self._cdn_bucket
 
     async def _request(self, endpoint: str, params: dict = None) -> dict:
-        await self._rate_limit()
-        session = await self._get_session()
-        url = f"{self.BASE_URL}{endpoint}"
-        async with session.get(url, params=params) as response:
-            if response.status == 429:  
-                retry_after = int(response.headers.get("X-RateLimit-Retry-After", 60))
-                await asyncio.sleep(retry_after)
-                return await self._request(endpoint, params)
-            response.raise_for_status()
-            return await response.json()
+        url = f"{self.base_url}{endpoint}"
+        return await self._http.get_json(url, params=params, bucket=self._bucket_for(url))
+
+    def rate_limit_stats(self) -> dict:
+        return {"api": self._api_bucket.stats(), "cdn": self._cdn_bucket.stats()}
 
     def _parse_manga(self, data: dict) -> MangaMetadata:
         manga_id = data["id"]
@@ -104,8 +195,8 @@ class MangaDexSource(MangaSource):
             year=attributes.get("year")
         )
 
-    async def search(self, query: str, page: int = 1, limit: int = 50) -> list[MangaMetadata]:
-        params = {
+    def _search_params(self, query: str, page: int, limit: int) -> dict:
+        return {
             "title": query,
             "limit": min(limit, 100),  
             "offset": (page - 1) * limit,
@@ -114,9 +205,17 @@ class MangaDexSource(MangaSource):
             "contentRating[]": ["safe", "suggestive", "erotica"],  
         }
 
-        data = await self._request("/manga", params)
+    async def search(self, query: str, page: int = 1, limit: int = 50) -> list[MangaMetadata]:
+        params = self._search_params(query, page, limit)
+        data = await self.responses.fetch_async("mangadex.search", params, lambda: self._request("/manga", params))
         return [self._parse_manga(manga) for manga in data.get("data", [])]
 
+    def cached_search(self, query: str, page: int = 1, limit: int = 50) -> Optional[tuple[list[MangaMetadata], bool]]:
+        hit = self.responses.get("mangadex.search", self._search_params(query, page, limit), allow_stale=True)
+        if hit is None:
+            return None
+        return [self._parse_manga(manga) for manga in hit.value.get("data", [])], hit.fresh
+
     async def get_manga(self, source_id: str) -> MangaMetadata:
         params = {
             "includes[]": ["cover_art", "author", "artist"]
@@ -124,56 +223,66 @@ class MangaDexSource(MangaSource):
         data = await self._request(f"/manga/{source_id}", params)
         return self._parse_manga(data["data"])
 
+    def _chapter_feed_params(self, source_id: str, language: str, offset: int) -> dict:
+        return {
+            "manga": source_id,
+            "translatedLanguage[]": [language],
+            "limit": self.CHAPTER_PAGE_LIMIT,
+            "offset": offset,
+            "order[chapter]": "asc",
+            "includes[]": ["scanlation_group"],
+            "contentRating[]": ["safe", "suggestive", "erotica"],
+        }
+
+    def _parse_chapter(self, chapter: dict, language: str) -> ChapterMetadata:
+        attrs = chapter["attributes"]
+        scanlation_group = None
+        for rel in chapter.get("relationships", []):
+            if rel["type"] == "scanlation_group":
+                scanlation_group = rel.get("attributes", {}).get("name")
+                break
+
+
+        published_at = None
+        if attrs.get("publishAt"):
+            try:
+                published_at = datetime.fromisoformat(attrs["publishAt"].replace("Z", "+00:00"))
+            except:
+                pass
+
+        return ChapterMetadata(
+            source_chapter_id=chapter["id"],
+            chapter_number=attrs.get("chapter") or "0",
+            title=attrs.get("title"),
+            language=attrs.get("translatedLanguage", language),
+            page_count=attrs.get("pages", 0),
+            scanlation_group=scanlation_group,
+            published_at=published_at,
+            volume=attrs.get("volume")
+        )
+
+    async def iter_chapters(self, source_id: str, language: str = "en") -> AsyncIterator[list[ChapterMetadata]]:
+        first = await self._request("/chapter", self._chapter_feed_params(source_id, language, 0))
+        yield [self._parse_chapter(ch, language) for ch in first.get("data", [])]
+
+        total = min(first.get("total", 0), self.MAX_FEED_OFFSET)
+        tasks = [
+            asyncio.ensure_future(self._request("/chapter", self._chapter_feed_params(source_id, language, offset)))
+            for offset in range(self.CHAPTER_PAGE_LIMIT, total, self.CHAPTER_PAGE_LIMIT)
+        ]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                data = await fut
+                yield [self._parse_chapter(ch, language) for ch in data.get("data", [])]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     async def get_chapters(self, source_id: str, language: str = "en") -> list[ChapterMetadata]:
         all_chapters = []
-        offset = 0
-        limit = 100
-        while True:
-            params = {
-                "manga": source_id,
-                "translatedLanguage[]": [language],
-                "limit": limit,
-                "offset": offset,
-                "order[chapter]": "asc",
-                "includes[]": ["scanlation_group"],
-                "contentRating[]": ["safe", "suggestive", "erotica"],
-            }
-
-            data = await self._request("/chapter", params)
-            chapters = data.get("data", [])
-            if not chapters:
-                break
-            for chapter in chapters:
-                attrs = chapter["attributes"]
-                scanlation_group = None
-                for rel in chapter.get("relationships", []):
-                    if rel["type"] == "scanlation_group":
-                        scanlation_group = rel.get("attributes", {}).get("name")
-                        break
-
-
-                published_at = None
-                if attrs.get("publishAt"):
-                    try:
-                        published_at = datetime.fromisoformat(attrs["publishAt"].replace("Z", "+00:00"))
-                    except:
-                        pass
-
-                chapter_metadata = ChapterMetadata(
-                    source_chapter_id=chapter["id"],
-                    chapter_number=attrs.get("chapter", "0"),
-                    title=attrs.get("title"),
-                    language=attrs.get("translatedLanguage", language),
-                    page_count=attrs.get("pages", 0),
-                    scanlation_group=scanlation_group,
-                    published_at=published_at,
-                    volume=attrs.get("volume")
-                )
-                all_chapters.append(chapter_metadata)
-            offset += limit
-
-            if offset >= data.get("total", 0):
-                break
+        async for batch in self.iter_chapters(source_id, language):
+            all_chapters.extend(batch)
 
         def chapter_sort_key(ch: ChapterMetadata):
             try:
@@ -184,34 +293,64 @@ class MangaDexSource(MangaSource):
         all_chapters.sort(key=chapter_sort_key)
         return all_chapters
 
+    async def _fetch_at_home_server(self, chapter_id: str) -> dict:
+        return await self._request(f"/at-home/server/{chapter_id}")
+
     async def get_pages(self, chapter_id: str) -> list[PageInfo]:
-        data = await self._request(f"/at-home/server/{chapter_id}")
-        base_url = data["baseUrl"]
-        chapter_hash = data["chapter"]["hash"]
-        filenames = data["chapter"]["data"]  
+        server = await self.at_home.server(chapter_id, refresh=True)
         pages = []
-        for i, filename in enumerate(filenames):
-            url = f"{base_url}/data/{chapter_hash}/{filename}"
+        for i in range(len(server.data)):
             pages.append(PageInfo(
                 page_number=i,
-                url=url
+                url=server.page_url(i)
             ))
 
         return pages
 
     async def download_image(self, url: str) -> bytes:
-        await self._rate_limit()
-        session = await self._get_session()
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return await response.read()
+        return await self._http.get_bytes(url, bucket=self._bucket_for(url))
+
+    def use_data_saver(self) -> bool:
+        return self.at_home.use_data_saver()
+
+    async def download_page(self, chapter_id: str, url: str, data_saver: Optional[bool] = None) -> bytes:
+        for switch in range(self.NODE_SWITCHES + 1):
+            live_url = await self.at_home.resolve(chapter_id, url, data_saver)
+            started = time.monotonic()
+            try:
+                data, transfer = await self._http.get_bytes_timed(live_url, bucket=self._cdn_bucket, attempts=self.PAGE_ATTEMPTS)
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+                expired = isinstance(e, aiohttp.ClientResponseError) and e.status in (403, 404, 410)
+                self.at_home.report_failure(chapter_id, expired=expired)
+                if switch == self.NODE_SWITCHES:
+                    raise
+                continue
+
+            elapsed = time.monotonic() - started
+            self.bandwidth.record(len(data), elapsed, transfer)
+            if elapsed > self.SLOW_PAGE_SECONDS:
+                self.at_home.report_failure(chapter_id)
+            else:
+                self.at_home.report_success(chapter_id)
+            return data
 
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
+        self._session = None
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
+
+
+_shared_source: Optional[MangaDexSource] = None
+
+
+def get_mangadex_source() -> MangaDexSource:
+    global _shared_source
+    if _shared_source is None:
+        _shared_source = MangaDexSource()
+    return _shared_source
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from typing import Mapping, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= 1
+        wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        return max(wait, self._blocked_until - now)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def block_for(self, seconds: float):
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._refill(now)
+        self._tokens = min(self._tokens, 0.0)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        limit = _header_float(headers, "X-RateLimit-Limit")
+        retry_after = retry_after_seconds(headers)
+
+        if limit is not None and limit > 0:
+            self.capacity = min(limit, self.max_capacity)
+        if remaining is None:
+            return
+
+        self._refill(time.monotonic())
+        if remaining < self._tokens:
+            self._tokens = remaining
+        if remaining <= 0 and retry_after:
+            self.block_for(retry_after)
+
+    def stats(self) -> dict:
+        self._refill(time.monotonic())
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": self._tokens,
+            "blocked_for": max(0.0, self._blocked_until - time.monotonic()),
+        }
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    value = _header_float(headers, "X-RateLimit-Retry-After")
+    if value is None:
+        value = _header_float(headers, "Retry-After")
+    if value is None:
+        return None
+    if value > 1e9:
+        value -= time.time()
+    return max(0.0, value)
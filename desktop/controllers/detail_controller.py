@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtWidgets import QListWidgetItem
@@ -6,7 +7,7 @@ from PySide6.QtGui import QPixmap
 from app.core.reader import list_chapters, list_pages
 from app.services.cover_service import cover_path_for_manga_dir
 from app.services.progress_services import load_progress
-from app.services.chapter_service import sync_fetch_chapters, get_manga_chapters
+from app.services.chapter_service import sort_chapters, stream_chapters
 from app.services.library_service import get_library
 from sqlmodel import select
 from app.db.session import get_session
@@ -14,11 +15,15 @@ from app.models import Manga
 
 
 class DetailController:
+    PREVIEW_CHAPTERS = 50
+
     def __init__(self, detail_page, open_manga_callback, get_manga_by_title, make_chapter_row_widget=None):
         self.detail_page = detail_page
         self.open_manga = open_manga_callback
         self.get_manga_by_title = get_manga_by_title
         self.make_row = make_chapter_row_widget or getattr(detail_page, "make_chapter_row_widget", None)
+        self._chapters_request = 0
+        self._chapters_task: asyncio.Task | None = None
 
     def show_library_title(self, title: str):
         m = self.get_manga_by_title().get(title)
@@ -32,10 +37,11 @@ class DetailController:
         self.detail_page.btn_open_link.setVisible(False)
 
         if not m:
+            self.refresh_detail_chapters(title)
             return
 
         cover = cover_path_for_manga_dir(m)
-        if cover.exists():
+        if cover:
             pix = QPixmap(str(cover))
             if not pix.isNull():
                 self.detail_page.detail_cover.setPixmap(
@@ -66,57 +72,25 @@ class DetailController:
     def refresh_detail_chapters(self, title: str):
         mdir = self.get_manga_by_title().get(title)
         self.detail_page.chapters_preview.clear()
-
-        if not mdir:
-            self.detail_page.detail_sub.setText("")
-            return
-
+        self._chapters_request += 1
+        if self._chapters_task is not None and not self._chapters_task.done():
+            self._chapters_task.cancel()
+        self._chapters_task = None
 
         if mdir is None:
-
             with get_session() as session:
                 manga = session.exec(
                     select(Manga).where(Manga.title == title)
                 ).first()
 
-                if manga and manga.source != "local":
-
-                    try:
-                        chapters = sync_fetch_chapters(manga.id)
-
-                        if not chapters:
-                            self.detail_page.detail_sub.setText("No chapters found")
-                            return
-
-                        self.detail_page.detail_sub.setText(f"{len(chapters)} chapters available")
-
-
-                        for chapter in chapters[:50]:  
-                            it = QListWidgetItem()
-                            it.setData(Qt.UserRole, ("online", manga.id, chapter.id, chapter.chapter_number))
-                            it.setSizeHint(QSize(0, 56))
-
-                            ch_title = chapter.title or f"Chapter {chapter.chapter_number}"
-                            group = f" [{chapter.scanlation_group}]" if chapter.scanlation_group else ""
-                            text = f"{ch_title}{group}  ({chapter.page_count} pages)"
-
-                            if self.make_row:
-                                w = self.make_row(ch_title, 1, chapter.page_count)
-                                self.detail_page.chapters_preview.addItem(it)
-                                self.detail_page.chapters_preview.setItemWidget(it, w)
-                            else:
-                                it.setText(text)
-                                self.detail_page.chapters_preview.addItem(it)
-
-                        if len(chapters) > 50:
-                            msg_item = QListWidgetItem(f"... and {len(chapters) - 50} more chapters")
-                            msg_item.setFlags(Qt.ItemFlag.NoItemFlags)
-                            self.detail_page.chapters_preview.addItem(msg_item)
-
-                    except Exception as e:
-                        self.detail_page.detail_sub.setText(f"Error loading chapters: {e}")
-                    return
-
+            if manga and manga.source != "local":
+                self.detail_page.detail_sub.setText("Loading chapters...")
+                self._chapters_task = asyncio.ensure_future(
+                    self._load_online_chapters(self._chapters_request, title, manga.id)
+                )
+            else:
+                self.detail_page.detail_sub.setText("")
+            return
 
         chapters = list_chapters(mdir)
         if not chapters:
@@ -149,6 +123,65 @@ class DetailController:
                 it.setText(f"{ch}  (p{cur}/{total})")
                 self.detail_page.chapters_preview.addItem(it)
 
+    def _is_current(self, rid: int, title: str) -> bool:
+        return rid == self._chapters_request and self.detail_page.detail_title.text() == title
+
+    async def _load_online_chapters(self, rid: int, title: str, manga_id: int):
+        chapters = []
+        try:
+            async for batch in stream_chapters(manga_id):
+                chapters.extend(batch)
+                if self._is_current(rid, title):
+                    self._render_online_chapters(manga_id, chapters, loading=True)
+        except Exception as e:
+            if self._is_current(rid, title):
+                self.detail_page.detail_sub.setText(f"Error loading chapters: {e}")
+            return
+
+        if not self._is_current(rid, title):
+            return
+
+        if not chapters:
+            self.detail_page.detail_sub.setText("No chapters found")
+            return
+
+        self._render_online_chapters(manga_id, chapters, loading=False)
+
+    def _render_online_chapters(self, manga_id: int, chapters: list, loading: bool):
+        preview = self.detail_page.chapters_preview
+        last = preview.item(preview.count() - 1) if preview.count() else None
+        if last is not None and last.data(Qt.UserRole) == "more":
+            preview.takeItem(preview.count() - 1)
+
+        if preview.count() < self.PREVIEW_CHAPTERS:
+            while preview.count():
+                preview.takeItem(0)
+            for chapter in sort_chapters(chapters)[:self.PREVIEW_CHAPTERS]:
+                it = QListWidgetItem()
+                it.setData(Qt.UserRole, ("online", manga_id, chapter.id, chapter.chapter_number))
+                it.setSizeHint(QSize(0, 56))
+
+                ch_title = chapter.title or f"Chapter {chapter.chapter_number}"
+                group = f" [{chapter.scanlation_group}]" if chapter.scanlation_group else ""
+                text = f"{ch_title}{group}  ({chapter.page_count} pages)"
+
+                if self.make_row:
+                    w = self.make_row(ch_title, 1, chapter.page_count)
+                    preview.addItem(it)
+                    preview.setItemWidget(it, w)
+                else:
+                    it.setText(text)
+                    preview.addItem(it)
+
+        if len(chapters) > self.PREVIEW_CHAPTERS:
+            msg_item = QListWidgetItem(f"... and {len(chapters) - self.PREVIEW_CHAPTERS} more chapters")
+            msg_item.setData(Qt.UserRole, "more")
+            msg_item.setFlags(Qt.ItemFlag.NoItemFlags)
+            preview.addItem(msg_item)
+
+        suffix = " (loading more...)" if loading else ""
+        self.detail_page.detail_sub.setText(f"{len(chapters)} chapters available{suffix}")
+
     def on_chapter_preview_activated(self, item: QListWidgetItem):
         ch = item.data(Qt.UserRole)
         if not ch:
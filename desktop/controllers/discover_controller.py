@@ -1,20 +1,30 @@
 from __future__ import annotations
 import re
-from PySide6.QtCore import Qt, QSize, QUrl
-from PySide6.QtGui import QDesktopServices
-from PySide6.QtWidgets import QListWidgetItem, QMenu, QMessageBox
-from desktop.widgets.manga_card import MangaCard
-from desktop.workers.discover_worker import DiscoverWorker
-from desktop.workers.mangadex_discover_worker import MangadexDiscoverWorker, MangadexDiscoverSignals
+from PySide6.QtCore import Qt, QModelIndex, QUrl
+from PySide6.QtGui import QDesktopServices, QImage
+from PySide6.QtWidgets import QMenu, QMessageBox
+from desktop.widgets.discover_grid import CoverUrlRole, DiscoverModel, MangaCardDelegate, item_title
+from desktop.workers.discover_worker import DiscoverWorker, cached_discover_items as anilist_cached_items
+from desktop.workers.mangadex_discover_worker import (
+    MangadexDiscoverWorker, MangadexDiscoverSignals, cached_discover_items as mangadex_cached_items,
+)
 from desktop.workers.cover_dl_worker import CoverDlWorker
+from desktop.workers.cover_scheduler import CoverFetchScheduler
 from desktop.utils import pixmap_cover_crop
+from app.services.cover_thumb_service import cached_cover_thumbnail, remember_cover_thumbnail
 from app.services.online_library_service import add_manga_to_library, is_in_library
+from app.core.cancel import CancelToken
+from app.core.config import (
+    COVER_PREFETCH_SCREENS, DISCOVER_LOAD_MORE_ROWS, DISCOVER_MAX_PAGES, DISCOVER_PREFETCH_PAGES,
+)
 
 class DiscoverController:
-    def __init__(self, threadpool, discover_list, coverdl_signals, discover_signals, detail_page, open_link_callback):
+    def __init__(self, threadpool, discover_list, coverdl_signals, coverthumb_signals, discover_signals, detail_page,
+                 open_link_callback):
         self.threadpool = threadpool
         self.discover_list = discover_list
         self.coverdl_signals = coverdl_signals
+        self.coverthumb_signals = coverthumb_signals
         self.discover_signals = discover_signals
         self.detail_page = detail_page
         self.open_link_callback = open_link_callback
@@ -27,8 +37,27 @@ class DiscoverController:
 
         self.selected_genres: set[str] = set()
         self.render_id = 0
-        self.cover_jobs: dict[str, QListWidgetItem] = {}
-
+        self.cover_failed: set[str] = set()
+        self.covers = CoverFetchScheduler(self.coverthumb_signals, self.cover_priority)
+
+        self.generation = 0
+        self.query_cancel = CancelToken()
+        self.mode = "trending"
+        self.query = ""
+        self.per_page = 50
+        self.shown_page = 0
+        self.fetched_page = 0
+        self.fetching_page: int | None = None
+        self.exhausted = False
+        self.buffered_pages: dict[int, list[dict]] = {}
+
+        self.model = DiscoverModel(cached_cover_thumbnail, self.discover_list)
+        self.delegate = MangaCardDelegate(self.request_cover, self.discover_list)
+        self.discover_list.setModel(self.model)
+        self.discover_list.setItemDelegate(self.delegate)
+        scrollbar = self.discover_list.verticalScrollBar()
+        scrollbar.valueChanged.connect(self.on_scrolled)
+        scrollbar.rangeChanged.connect(self.on_scrolled)
 
         self.use_mangadex = True
         self.mangadex_signals = MangadexDiscoverSignals()
@@ -36,34 +65,116 @@ class DiscoverController:
 
         self.discover_signals.done.connect(self.on_done)
         self.coverdl_signals.done.connect(self.on_cover_done)
+        self.coverthumb_signals.done.connect(self.on_cover_thumb_done)
 
 
         self.detail_page.btn_add_library.clicked.connect(self.add_to_library)
 
     def load(self, q: str):
         q = (q or "").strip()
-        mode = "search" if q else "trending"
-        self.discover_list.clear()
-        self.discover_list.addItem(QListWidgetItem("Loading…"))
-
-
+        # A new query supersedes every request of the previous one, including later pages.
+        self.query_cancel.cancel()
+        self.query_cancel = CancelToken()
+        self.generation += 1
+        self.covers.reset()
+        self.cover_failed.clear()
+        self.mode = "search" if q else "trending"
+        self.query = q
+        self.per_page = 50 if self.use_mangadex else 24
+        self.shown_page = 0
+        self.fetched_page = 0
+        self.fetching_page = None
+        self.exhausted = False
+        self.buffered_pages = {}
+
+        cached = self.cached_page(1)
+        if cached is None:
+            self.model.set_message("Loading…")
+            self.fetch_page(1)
+            return
+        # Stale-while-revalidate: render the stored page now and refresh it in the background.
+        items, fresh = cached
+        if not fresh:
+            self.fetch_page(1)
+        self.receive_page(1, items)
+
+    def cached_page(self, page: int):
+        lookup = mangadex_cached_items if self.use_mangadex else anilist_cached_items
+        return lookup(self.mode, self.query, page, self.per_page)
+
+    def fetch_page(self, page: int):
+        self.fetching_page = page
         if self.use_mangadex:
-            worker = MangadexDiscoverWorker(mode, q, self.mangadex_signals, page=1, per_page=50)
+            worker = MangadexDiscoverWorker(self.mode, self.query, self.mangadex_signals, page=page, per_page=self.per_page,
+                                            generation=self.generation, cancel=self.query_cancel)
         else:
-
-            worker = DiscoverWorker(mode, q, self.discover_signals)
+            worker = DiscoverWorker(self.mode, self.query, self.discover_signals, page=page, per_page=self.per_page,
+                                    generation=self.generation, cancel=self.query_cancel)
 
         self.threadpool.start(worker)
 
-    def on_done(self, items: list, err: str):
+    def on_done(self, items: list, err: str, page: int, generation: int):
+        if generation != self.generation or page != self.fetching_page:
+            return
+        self.fetching_page = None
+
         if err:
-            self.items_all = []
-            self.items_view = []
-            self.discover_list.clear()
-            self.discover_list.addItem(QListWidgetItem(f"Error: {err}"))
+            if page == 1 and not self.shown_page:
+                self.items_all = []
+                self.items_view = []
+                self.model.set_message(f"Error: {err}")
+            # A failed later page is retried the next time the user scrolls near the end.
             return
-        self.items_all = list(items or [])
-        self.apply_filters_and_render()
+
+        self.receive_page(page, list(items or []))
+
+    def receive_page(self, page: int, items: list[dict]):
+        self.fetched_page = page
+        self.exhausted = len(items) < self.per_page or page >= DISCOVER_MAX_PAGES
+
+        if page == 1:
+            # A background refresh that matches what is on screen leaves the grid untouched.
+            unchanged = self.shown_page and [m.get("id") for m in items] == [m.get("id") for m in self.items_all]
+            if not unchanged:
+                self.shown_page = 1
+                self.buffered_pages = {}
+                self.items_all = items
+                self.apply_filters_and_render()
+        else:
+            self.buffered_pages[page] = items
+            if self.near_end():
+                self.show_next_page()
+        self.prefetch_pages()
+
+    def on_scrolled(self, *_):
+        if not self.shown_page:
+            return
+        self.request_nearby_covers()
+        if self.near_end():
+            self.show_next_page()
+            self.prefetch_pages()
+
+    def near_end(self) -> bool:
+        scrollbar = self.discover_list.verticalScrollBar()
+        row_height = self.discover_list.gridSize().height() or 1
+        return scrollbar.maximum() - scrollbar.value() <= row_height * DISCOVER_LOAD_MORE_ROWS
+
+    def show_next_page(self):
+        items = self.buffered_pages.pop(self.shown_page + 1, None)
+        if items is None:
+            return
+        self.shown_page += 1
+        self.items_all.extend(items)
+        new_view = self.filter_items(items)
+        self.items_view.extend(new_view)
+        self.model.append_items(new_view)
+
+    def prefetch_pages(self):
+        # Pages are fetched one at a time, so prefetching never bursts past the source's rate limit.
+        if self.fetching_page is not None or self.exhausted or not self.fetched_page:
+            return
+        if self.fetched_page < self.shown_page + DISCOVER_PREFETCH_PAGES:
+            self.fetch_page(self.fetched_page + 1)
 
     def available_genres(self) -> list[str]:
         s: set[str] = set()
@@ -105,53 +216,76 @@ class DiscoverController:
             self.selected_genres.discard(genre)
         self.apply_filters_and_render()
 
-    def apply_filters_and_render(self):
+    def filter_items(self, items: list[dict]) -> list[dict]:
         if not self.selected_genres:
-            self.items_view = list(self.items_all)
-        else:
-            want = set(self.selected_genres)
-            out = []
-            for m in self.items_all:
-                gs = set(m.get("genres") or [])
-                if gs & want:
-                    out.append(m)
-            self.items_view = out
+            return list(items)
+        want = set(self.selected_genres)
+        out = []
+        for m in items:
+            gs = set(m.get("genres") or [])
+            if gs & want:
+                out.append(m)
+        return out
+
+    def apply_filters_and_render(self):
+        self.items_view = self.filter_items(self.items_all)
         self.render()
 
     def render(self):
         self.render_id += 1
-        rid = self.render_id
-
-        self.discover_list.blockSignals(True)
-        self.discover_list.clear()
-        self.cover_jobs = {}
+        self.covers.reset()
+        self.cover_failed.clear()
 
         items = self.items_view
         if not items:
-            it = QListWidgetItem("No results (genre filter too strict?)")
-            self.discover_list.addItem(it)
-            self.discover_list.blockSignals(False)
+            self.model.set_message("No results (genre filter too strict?)")
             return
 
-        for i, m in enumerate(items):
-            title = self._discover_title(m)
-            it = QListWidgetItem()
-            it.setData(Qt.UserRole, m)
-            it.setSizeHint(QSize(190, 270))
+        self.model.set_items(items)
+        self.discover_list.setCurrentIndex(self.model.index(0))
 
-            card = MangaCard(title)
-            self.discover_list.addItem(it)
-            self.discover_list.setItemWidget(it, card)
-
-            url = (m.get("coverImage") or {}).get("large")
-            if url:
-                key = f"{rid}:{i}"
-                self.cover_jobs[key] = it
-                self.threadpool.start(CoverDlWorker(key, url, self.coverdl_signals))
+    def request_cover(self, url: str):
+        if url in self.cover_failed:
+            return
+        self.covers.request(url)
+
+    def cover_priority(self, url: str) -> int | None:
+        # Pixels between the card and the viewport; None once it is further than the prefetch reach.
+        viewport = self.discover_list.viewport().rect()
+        reach = viewport.height() * COVER_PREFETCH_SCREENS
+        best = None
+        for row in self.model.rows_for_url(url):
+            rect = self.discover_list.visualRect(self.model.index(row))
+            if rect.intersects(viewport):
+                distance = 0
+            elif rect.top() > viewport.bottom():
+                distance = rect.top() - viewport.bottom()
+            else:
+                distance = viewport.top() - rect.bottom()
+            if distance <= reach and (best is None or distance < best):
+                best = distance
+        return best
+
+    def request_nearby_covers(self):
+        # Queue the visible rows plus the next screen; the scheduler serves the visible ones first.
+        rows = len(self.model.items)
+        viewport = self.discover_list.viewport().rect()
+        lo, hi = 0, rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.discover_list.visualRect(self.model.index(mid)).bottom() < viewport.top():
+                lo = mid + 1
+            else:
+                hi = mid
 
-        self.discover_list.blockSignals(False)
-        if self.discover_list.count():
-            self.discover_list.setCurrentRow(0)
+        limit = viewport.bottom() + viewport.height() * COVER_PREFETCH_SCREENS
+        for row in range(lo, rows):
+            index = self.model.index(row)
+            if self.discover_list.visualRect(index).top() > limit:
+                break
+            url = index.data(CoverUrlRole)
+            if url and cached_cover_thumbnail(url) is None:
+                self.request_cover(url)
 
     def on_cover_done(self, key: str, path: str):
         if not path:
@@ -169,29 +303,15 @@ class DiscoverController:
                 self.detail_page.detail_cover.setPixmap(pix)
             return
 
-        if ":" not in key:
-            return
-        rid_s, idx_s = key.split(":", 1)
-        try:
-            rid = int(rid_s)
-            _ = int(idx_s)
-        except:
-            return
-        if rid != self.render_id:
-            return
-
-        it = self.cover_jobs.get(key)
-        if not it:
-            return
-        card = self.discover_list.itemWidget(it)
-        if not card:
+    def on_cover_thumb_done(self, key: str, url: str, image: QImage):
+        if image.isNull():
+            self.cover_failed.add(url)
             return
-        pix = pixmap_cover_crop(path, QSize(160, 220))
-        if not pix.isNull():
-            card.set_cover_pixmap(pix)
+        remember_cover_thumbnail(url, image)
+        self.model.cover_ready(url)
 
-    def on_selected(self, current: QListWidgetItem | None):
-        if not current:
+    def on_selected(self, current: QModelIndex | None):
+        if current is None or not current.isValid():
             return
         m = current.data(Qt.UserRole)
         if not m or not isinstance(m, dict):
@@ -270,8 +390,8 @@ class DiscoverController:
         desc = self._clean_desc(m.get("description") or "")
         self.detail_page.detail_desc.setText(desc if desc else "No summary available.")
 
-    def open_selected(self, item: QListWidgetItem):
-        m = item.data(Qt.UserRole)
+    def open_selected(self, index: QModelIndex):
+        m = index.data(Qt.UserRole)
         if not m or not isinstance(m, dict):
             return
         url = m.get("siteUrl")
@@ -283,8 +403,7 @@ class DiscoverController:
             self.open_link_callback(self.selected_link)
 
     def _discover_title(self, m: dict) -> str:
-        t = m.get("title") or {}
-        return t.get("english") or t.get("romaji") or t.get("native") or "Untitled"
+        return item_title(m)
 
     def _clean_desc(self, s: str) -> str:
         if not s:
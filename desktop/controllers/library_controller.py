@@ -1,13 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
 from PySide6.QtCore import Qt, QThreadPool
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QImage
 from PySide6.QtWidgets import QListWidget, QListWidgetItem
 
 from app.core.reader import list_chapters
 from app.services.cover_service import cover_path_for_manga_dir
+from app.services.cover_thumb_service import cached_cover_thumbnail, remember_cover_thumbnail
 from app.services.library_service import get_library, sync_library
-from desktop.workers import CoverWorker, CoverSignals
+from desktop.workers import CoverWorker, CoverSignals, CoverThumbSignals, CoverThumbWorker
 
 
 class LibraryController:
@@ -16,6 +17,7 @@ class LibraryController:
         threadpool: QThreadPool,
         manga_list: QListWidget,
         cover_signals: CoverSignals,
+        thumb_signals: CoverThumbSignals,
         on_cover_done,
         clear_detail,
         set_selected_title,
@@ -24,6 +26,8 @@ class LibraryController:
         self.manga_list = manga_list
         self.cover_signals = cover_signals
         self.cover_signals.done.connect(on_cover_done)
+        self.thumb_signals = thumb_signals
+        self.thumb_signals.done.connect(self.on_thumb_done)
         self.clear_detail = clear_detail
         self.set_selected_title = set_selected_title
         self.rows = []
@@ -85,8 +89,8 @@ class LibraryController:
             if m.path:  
                 manga_dir = Path(m.path)
                 cover = cover_path_for_manga_dir(manga_dir)
-                if cover.exists():
-                    it.setIcon(QIcon(str(cover)))
+                if cover:
+                    self.set_cover(it, cover)
                 else:
                     ch = list_chapters(manga_dir)
                     if ch:
@@ -94,9 +98,7 @@ class LibraryController:
             else:  
                 cover_url = getattr(m, "cover_url", None)
                 if cover_url:
-
-
-                    pass
+                    self.set_cover(it, url=cover_url)
 
             self.manga_list.addItem(it)
 
@@ -109,3 +111,32 @@ class LibraryController:
                 self.set_selected_title(it.data(Qt.UserRole) or "")
         else:
             self.clear_detail()
+
+    def set_cover(self, it: QListWidgetItem, path: Path | None = None, url: str | None = None):
+        # Icons come from the shared card thumbnails, never from the full-size cover.
+        key = str(path) if path else url
+        thumb = cached_cover_thumbnail(key)
+        if thumb:
+            it.setIcon(QIcon(thumb))
+            return
+        self.threadpool.start(CoverThumbWorker(it.data(Qt.UserRole) or "", key, self.thumb_signals, path=path))
+
+    def set_cover_for_title(self, title: str, path: Path):
+        it = self._item_for_title(title)
+        if it is not None:
+            self.set_cover(it, path)
+
+    def on_thumb_done(self, title: str, key: str, image: QImage):
+        if image.isNull():
+            return
+        pixmap = remember_cover_thumbnail(key, image)
+        it = self._item_for_title(title)
+        if it is not None:
+            it.setIcon(QIcon(pixmap))
+
+    def _item_for_title(self, title: str) -> QListWidgetItem | None:
+        for i in range(self.manga_list.count()):
+            it = self.manga_list.item(i)
+            if (it.data(Qt.UserRole) or "") == title:
+                return it
+        return None
@@ -1,15 +1,16 @@
 from __future__ import annotations
 from pathlib import Path
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
-from PIL import Image
-from PIL.ImageQt import ImageQt
+from PySide6.QtCore import Qt, QSize, QTimer
+from PySide6.QtGui import QImage, QPixmap
 import asyncio
 
 from app.core.reader import list_pages
 from app.services.progress_services import load_progress, save_progress
-from app.services.chapter_service import sync_fetch_pages, get_chapter_pages
+from app.services.chapter_service import fetch_and_store_pages, get_next_chapter
 from app.services.page_loader import get_page_loader
+from app.services.read_ahead import ReadAheadScheduler
+from app.services.display_scaler import DisplayScaler
+from app.core.config import RESIZE_DEBOUNCE_MS
 from app.db.session import get_session
 from app.models import Chapter, Page as PageModel
 
@@ -26,7 +27,8 @@ class ReaderController:
         self.current_chapter_dir: Path | None = None
         self.pages: list[Path] = []
         self.page_idx = 0
-        self.original_pixmap: QPixmap | None = None
+        self.original_image: QImage | None = None
+        self._page_key: str | None = None
         self.fit_mode = "width"
         self.direction = "LTR"
 
@@ -35,9 +37,20 @@ class ReaderController:
         self.current_chapter: Chapter | None = None
         self.online_pages: list[PageModel] = []
         self.page_loader = get_page_loader()
+        self.read_ahead = ReadAheadScheduler(self.page_loader)
+        self.scaler = DisplayScaler(self.page_loader.image_cache, self.page_loader.decoder)
+        self._request_id = 0
+
+        self._rescale_timer = QTimer()
+        self._rescale_timer.setSingleShot(True)
+        self._rescale_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self._rescale_timer.timeout.connect(self._rescale)
 
     def load_chapter(self, manga_dir: Path, chapter_dir: Path):
 
+        self._request_id += 1
+        self.page_loader.cancel_prefetch()
+        self.read_ahead.cancel()
         self.is_online = False
         self.current_manga_dir = manga_dir
         self.current_chapter_dir = chapter_dir
@@ -64,11 +77,21 @@ class ReaderController:
         self.current_manga_dir = None
         self.current_chapter_dir = None
         self.pages = []
+        self.online_pages = []
+        self.original_image = None
+        self._page_key = None
+        self.page_idx = 0
+        self._request_id += 1
+        rid = self._request_id
+        self.page_loader.cancel_prefetch()
+        self.read_ahead.cancel()
+        self.read_ahead.reset()
 
 
         with get_session() as session:
             chapter = session.get(Chapter, chapter_id)
             if not chapter:
+                self.current_chapter = None
                 self.image_label.setText("Chapter not found")
                 return
 
@@ -83,25 +106,34 @@ class ReaderController:
                 page_count=chapter.page_count
             )
 
+        self.image_label.setText("Loading chapter...")
+        self._sync_slider()
+        self._update_info()
+        asyncio.ensure_future(self._open_online_chapter(rid, chapter_id))
 
+    async def _open_online_chapter(self, rid: int, chapter_id: int):
         try:
-            self.online_pages = sync_fetch_pages(chapter_id)
-
-            if not self.online_pages:
-                self.image_label.setText("No pages found in chapter")
+            pages = await fetch_and_store_pages(chapter_id)
+        except Exception as e:
+            if rid == self._request_id:
+                self.image_label.setText(f"Error loading chapter: {e}")
                 self._sync_slider()
                 self._update_info()
-                return
-
+            return
 
-            self.page_idx = 0
-            self._sync_slider()
-            self.show_page()
+        if rid != self._request_id:
+            return
 
-        except Exception as e:
-            self.image_label.setText(f"Error loading chapter: {e}")
+        self.online_pages = pages
+        if not self.online_pages:
+            self.image_label.setText("No pages found in chapter")
             self._sync_slider()
             self._update_info()
+            return
+
+        self.page_idx = 0
+        self._sync_slider()
+        self.show_page()
 
     def set_fit(self, fit_mode: str):
         self.fit_mode = fit_mode
@@ -131,6 +163,10 @@ class ReaderController:
         if self.page_idx < max_idx:
             self.page_idx += 1
             self.show_page()
+        elif self.is_online and self.current_chapter and self.online_pages:
+            nxt = get_next_chapter(self.current_chapter.id)
+            if nxt:
+                self.load_online_chapter(nxt.id)
 
     def prev_page(self):
         if self.page_idx > 0:
@@ -147,77 +183,170 @@ class ReaderController:
 
         if not self.pages:
             return
+        self._request_id += 1
+        rid = self._request_id
         p = self.pages[self.page_idx]
-        img = Image.open(p).convert("RGB")
-        self.original_pixmap = QPixmap.fromImage(ImageQt(img))
-        self.apply_pixmap()
         self._sync_slider(set_value=True)
         self._update_info()
         self._save_progress()
 
+        cached = self.page_loader.get_cached_file_image(p)
+        if cached:
+            self._set_original(str(p), cached)
+        else:
+            asyncio.ensure_future(self._load_local_page(rid, p))
+
+    async def _load_local_page(self, rid: int, p: Path):
+        try:
+            image = await self.page_loader.load_file_image(p)
+        except Exception as e:
+            if rid == self._request_id:
+                self.image_label.setText(f"Error loading page: {e}")
+            return
+
+        if rid != self._request_id:
+            return
+        self._set_original(str(p), image)
+
     def _show_online_page(self):
 
         if not self.online_pages or not self.current_chapter:
             return
 
+        self._request_id += 1
+        rid = self._request_id
         page = self.online_pages[self.page_idx]
+        self._sync_slider(set_value=True)
+        self._update_info()
+        self.set_title(f"Mangareader — {self._online_title()} — {self.page_idx+1}/{len(self.online_pages)}")
 
+        # The key also fixes the quality, so a data-saver switch mid-download cannot mislabel the image.
+        key = self.page_loader.cache_id(page)
+        cached = self.page_loader.get_cached_image(page, key)
+        if cached:
+            self._set_original(key, cached)
+        else:
+            self.original_image = None
+            self._page_key = None
+            self.image_label.setText("Loading page...")
+            asyncio.ensure_future(self._load_online_page(rid, self.current_chapter, page, key))
 
-        self.image_label.setText("Loading page...")
+        self.read_ahead.schedule(self.current_chapter, self.online_pages, self.page_idx)
 
+    async def _load_online_page(self, rid: int, chapter: Chapter, page: PageModel, key: str):
         try:
+            image = await self.page_loader.load_page_image(chapter, page, key)
+        except Exception as e:
+            if rid == self._request_id:
+                self.image_label.setText(f"Error loading page: {e}")
+            return
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                pixmap = loop.run_until_complete(
-                    self.page_loader.load_page_pixmap(self.current_chapter, page)
-                )
-                self.original_pixmap = pixmap
-                self.apply_pixmap()
-                self._sync_slider(set_value=True)
-                self._update_info()
 
-            finally:
-                loop.close()
+        if rid != self._request_id:
+            return
+        self._set_original(key, image)
 
-        except Exception as e:
-            self.image_label.setText(f"Error loading page: {e}")
-        self._update_info()
+    def _save_progress(self):
+        if not self.pages:
+            return
+        p = self.pages[self.page_idx]
         if self.current_chapter_dir:
             save_progress(str(self.current_chapter_dir), self.page_idx)
         self.set_title(f"Mangareader — {p.parent.parent.name} / {p.parent.name} — {self.page_idx+1}/{len(self.pages)}")
 
+    def _online_title(self) -> str:
+        ch = self.current_chapter
+        if not ch:
+            return ""
+        return ch.title or f"Chapter {ch.chapter_number}"
+
+    def _set_original(self, key: str, image: QImage):
+        self._page_key = key
+        self.original_image = image
+        self.apply_pixmap()
+
+    def _target_size(self) -> QSize:
+        return self.scaler.target_size(self.original_image.size(), self.scroll.viewport().size(), self.fit_mode)
+
+    def _dpr(self) -> float:
+        return self.scroll.devicePixelRatioF()
+
+    def _show_scaled(self, pixmap: QPixmap):
+        self.image_label.setPixmap(pixmap)
+        self.image_label.adjustSize()
+
     def apply_pixmap(self):
-        if not self.original_pixmap:
+        if self.original_image is None:
             return
 
-        vw = max(1, self.scroll.viewport().width())
-        vh = max(1, self.scroll.viewport().height())
-        ow = self.original_pixmap.width()
-        oh = self.original_pixmap.height()
-        scale_h = vh / max(1, oh)
+        cached = self.scaler.cached(self._page_key, self._target_size(), self._dpr())
+        if cached:
+            self._rescale_timer.stop()
+            self._show_scaled(cached)
+            return
+        self._rescale()
 
-        if self.fit_mode == "height":
-            if scale_h * ow < vw * 0.65:
-                target = self.original_pixmap.scaledToWidth(vw, Qt.SmoothTransformation)
-            else:
-                target = self.original_pixmap.scaledToHeight(vh, Qt.SmoothTransformation)
-        else:
-            target = self.original_pixmap.scaledToWidth(vw, Qt.SmoothTransformation)
+    def on_resize(self):
+        if self.original_image is None:
+            return
 
-        self.image_label.setPixmap(target)
-        self.image_label.adjustSize()
+        size, dpr = self._target_size(), self._dpr()
+        cached = self.scaler.cached(self._page_key, size, dpr)
+        if cached:
+            self._rescale_timer.stop()
+            self._show_scaled(cached)
+            return
+
+        # Stretch the closest scale we already have until the resize settles.
+        nearest = self.scaler.nearest(self._page_key, size, dpr)
+        if nearest:
+            stretched = nearest.scaled(self.scaler.physical_size(size, dpr), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+            stretched.setDevicePixelRatio(dpr)
+            self._show_scaled(stretched)
+        self._rescale_timer.start()
+
+    def _rescale(self):
+        self._rescale_timer.stop()
+        if self.original_image is None:
+            return
+        asyncio.ensure_future(
+            self._scale_current(self._request_id, self._page_key, self.original_image, self._target_size(), self._dpr())
+        )
+
+    async def _scale_current(self, rid: int, key: str, image: QImage, size: QSize, dpr: float):
+        try:
+            pixmap = await self.scaler.scaled(key, image, size, dpr)
+        except Exception as e:
+            if rid == self._request_id and key == self._page_key:
+                self.image_label.setText(f"Error displaying page: {e}")
+            return
+
+        if rid != self._request_id or key != self._page_key or self.original_image is None:
+            return
+        if size != self._target_size() or dpr != self._dpr():
+            return
+        self._show_scaled(pixmap)
 
     def _sync_slider(self, set_value: bool = False):
         self.page_slider.blockSignals(True)
         self.page_slider.setMinimum(1)
-        self.page_slider.setMaximum(max(1, len(self.pages)))
+        self.page_slider.setMaximum(max(1, self._page_count()))
         if set_value:
             self.page_slider.setValue(self.page_idx + 1)
         self.page_slider.blockSignals(False)
 
+    def _page_count(self) -> int:
+        return len(self.online_pages) if self.is_online else len(self.pages)
+
     def _update_info(self):
+        if self.is_online:
+            if not self.current_chapter or not self.online_pages:
+                self.reader_info.setText("No chapter loaded")
+                return
+            self.reader_info.setText(
+                f"{self._online_title()}\nPage {self.page_idx+1} / {len(self.online_pages)}\nDirection: {self.direction}\nFit: {self.fit_mode}"
+            )
+            return
         if not self.current_manga_dir or not self.current_chapter_dir or not self.pages:
             self.reader_info.setText("No chapter loaded")
             return
@@ -1,15 +1,17 @@
 from __future__ import annotations
+from pathlib import Path
 from PySide6.QtCore import Qt, QSize, QUrl, QTimer, QThreadPool
-from PySide6.QtGui import QIcon, QPixmap, QDesktopServices
+from PySide6.QtGui import QPixmap, QDesktopServices
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QListWidget, QListWidgetItem, QLabel, QHBoxLayout, QVBoxLayout,
+    QMainWindow, QWidget, QListWidget, QListWidgetItem, QListView, QLabel, QHBoxLayout, QVBoxLayout,
     QSplitter, QScrollArea, QFileDialog, QLineEdit, QStackedWidget, QDockWidget,
-    QButtonGroup, QToolButton, QMenu
+    QButtonGroup, QToolButton, QMenu, QInputDialog
 )
 
-from app.core.config import MANGA_DIR
+from app.core.config import MANGA_DIR, MEMORY_CHECK_MS, MIN_MEMORY_CACHE_MB
+from app.cache import MemoryPressureMonitor, get_image_cache
 from app.core.reader import list_chapters
-from app.services.settings_service import set_library_root, get_library_root
+from app.services.settings_service import set_library_root, get_library_root, get_cache_limits, set_cache_limits
 from app.services.library_service import mark_opened
 from desktop.theme.palette import apply_palette
 from desktop.theme.stylesheet import apply_stylesheet
@@ -17,6 +19,7 @@ from desktop.pages.detail_page import DetailPage
 from desktop.pages.chapters_page import ChaptersPage
 
 from desktop.workers.cover_dl_worker import CoverDlSignals
+from desktop.workers.cover_thumb_worker import CoverThumbSignals
 from desktop.workers.discover_worker import DiscoverSignals
 from desktop.workers import CoverSignals
 
@@ -40,12 +43,21 @@ class MainWindow(QMainWindow):
         self.cover_signals = CoverSignals()
         self.discover_signals = DiscoverSignals()
         self.coverdl_signals = CoverDlSignals()
+        self.coverthumb_signals = CoverThumbSignals()
+        self.librarythumb_signals = CoverThumbSignals()
 
         self.search_timer = QTimer(self)
         self.search_timer.setSingleShot(True)
         self.search_timer.setInterval(300)
         self.search_timer.timeout.connect(self.on_search_debounced)
 
+        get_image_cache().set_limits(*get_cache_limits())
+        self.memory_monitor = MemoryPressureMonitor(get_image_cache())
+        self.memory_timer = QTimer(self)
+        self.memory_timer.setInterval(MEMORY_CHECK_MS)
+        self.memory_timer.timeout.connect(self.memory_monitor.check)
+        self.memory_timer.start()
+
         self._build_ui()
         self._controllers()
         self._wire()
@@ -103,15 +115,16 @@ class MainWindow(QMainWindow):
         self.manga_list.setUniformItemSizes(True)
         self.manga_list.setWordWrap(True)
 
-        self.discover_list = QListWidget()
-        self.discover_list.setViewMode(QListWidget.IconMode)
+        self.discover_list = QListView()
+        self.discover_list.setViewMode(QListView.IconMode)
         self.discover_list.setIconSize(QSize(160, 220))
         self.discover_list.setGridSize(QSize(190, 270))
-        self.discover_list.setResizeMode(QListWidget.Adjust)
-        self.discover_list.setMovement(QListWidget.Static)
+        self.discover_list.setResizeMode(QListView.Adjust)
+        self.discover_list.setMovement(QListView.Static)
         self.discover_list.setSpacing(10)
         self.discover_list.setWordWrap(True)
         self.discover_list.setUniformItemSizes(True)
+        self.discover_list.setMouseTracking(True)
 
         self.left_stack = QStackedWidget()
         self.left_stack.addWidget(self.manga_list)
@@ -159,6 +172,10 @@ class MainWindow(QMainWindow):
         action = menu.addAction("Import Library Folder…")
         action.triggered.connect(self.import_library_folder)
 
+        settings_menu = self.menuBar().addMenu("Settings")
+        action = settings_menu.addAction("Cache Limits…")
+        action.triggered.connect(self.edit_cache_limits)
+
         self.reader_dock = QDockWidget("Reader", self)
         self.reader_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         self.reader_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetClosable)
@@ -180,6 +197,7 @@ class MainWindow(QMainWindow):
             threadpool=self.threadpool,
             manga_list=self.manga_list,
             cover_signals=self.cover_signals,
+            thumb_signals=self.librarythumb_signals,
             on_cover_done=self.on_cover_done,
             clear_detail=self.detail_page.clear,
             set_selected_title=self.detail_controller.show_library_title,
@@ -189,6 +207,7 @@ class MainWindow(QMainWindow):
             threadpool=self.threadpool,
             discover_list=self.discover_list,
             coverdl_signals=self.coverdl_signals,
+            coverthumb_signals=self.coverthumb_signals,
             discover_signals=self.discover_signals,
             detail_page=self.detail_page,
             open_link_callback=self._open_url,
@@ -215,8 +234,8 @@ class MainWindow(QMainWindow):
         self.manga_list.currentItemChanged.connect(self.on_manga_selected)
         self.detail_page.chapters_preview.itemActivated.connect(self.detail_controller.on_chapter_preview_activated)
 
-        self.discover_list.currentItemChanged.connect(lambda cur, _: self.discover_controller.on_selected(cur))
-        self.discover_list.itemActivated.connect(self.discover_controller.open_selected)
+        self.discover_list.selectionModel().currentChanged.connect(lambda cur, _: self.discover_controller.on_selected(cur))
+        self.discover_list.activated.connect(self.discover_controller.open_selected)
 
         self.detail_page.btn_continue.clicked.connect(self.continue_selected_manga)
         self.detail_page.btn_open.clicked.connect(self.open_selected_manga)
@@ -236,6 +255,20 @@ class MainWindow(QMainWindow):
         set_library_root(path)
         self.library_controller.reload()
 
+    def edit_cache_limits(self):
+        memory_mb, disk_mb = get_cache_limits()
+        memory_mb, ok = QInputDialog.getInt(self, "Cache Limits", "Memory cache (MB):", memory_mb, MIN_MEMORY_CACHE_MB, 16384)
+        if not ok:
+            return
+        disk_mb, ok = QInputDialog.getInt(self, "Cache Limits", "Disk cache (MB):", disk_mb, 0, 1024 * 1024)
+        if not ok:
+            return
+        self.apply_cache_limits(memory_mb, disk_mb)
+
+    def apply_cache_limits(self, memory_mb: int, disk_mb: int):
+        set_cache_limits(memory_mb, disk_mb)
+        get_image_cache().set_limits(memory_mb, disk_mb)
+
     def set_ui_mode(self, mode: str):
         if mode == "library":
             self.reader_dock.setVisible(False)
@@ -426,9 +459,13 @@ class MainWindow(QMainWindow):
         chapter_dir = manga_dir / chapter_name
         self.reader_controller.load_chapter(manga_dir, chapter_dir)
 
+    def closeEvent(self, event):
+        self.discover_controller.covers.shutdown()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.reader_controller.apply_pixmap()
+        self.reader_controller.on_resize()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
@@ -454,11 +491,7 @@ class MainWindow(QMainWindow):
         pix = QPixmap(cover_path)
         if pix.isNull():
             return
-        for i in range(self.manga_list.count()):
-            it = self.manga_list.item(i)
-            if (it.data(Qt.UserRole) or "") == title:
-                it.setIcon(QIcon(cover_path))
-                break
+        self.library_controller.set_cover_for_title(title, Path(cover_path))
         if self.detail_page.detail_title.text() == title:
             self.detail_page.detail_cover.setPixmap(
                 pix.scaled(self.detail_page.detail_cover.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -2,7 +2,14 @@ from PySide6.QtCore import QSize
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
 
+from app.cache import get_image_cache
+
 def pixmap_cover_crop(path: str, size: QSize) -> QPixmap:
+    cache = get_image_cache("covers")
+    cached = cache.get(f"crop:{path}", size)
+    if cached:
+        return cached
+
     pix = QPixmap(path)
     if pix.isNull():
         return QPixmap()
@@ -12,4 +19,5 @@ def pixmap_cover_crop(path: str, size: QSize) -> QPixmap:
     y = max(0, (pix.height() - size.height()) // 2)
     pix = pix.copy(x, y, size.width(), size.height())
     pix.setDevicePixelRatio(1.0)
+    cache.put(f"crop:{path}", pix, size, save_to_disk=False)
     return pix
@@ -0,0 +1,147 @@
+from typing import Callable, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPainterPath, QPixmap
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+CARD_SIZE = QSize(190, 270)
+COVER_SIZE = QSize(160, 220)
+COVER_RADIUS = 14
+
+CoverUrlRole = Qt.UserRole + 1
+
+
+def item_title(m: dict) -> str:
+    t = m.get("title") or {}
+    return t.get("english") or t.get("romaji") or t.get("native") or "Untitled"
+
+
+def item_cover_url(m: dict) -> Optional[str]:
+    return (m.get("coverImage") or {}).get("large")
+
+
+class DiscoverModel(QAbstractListModel):
+    def __init__(self, cover_lookup: Callable[[str], Optional[QPixmap]], parent=None):
+        super().__init__(parent)
+        self.cover_lookup = cover_lookup
+        self.items: list[dict] = []
+        self.message = ""
+        self._rows_by_url: dict[str, list[int]] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.items) if self.items else int(bool(self.message))
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self.items:
+            return self.message if role == Qt.DisplayRole else None
+
+        m = self.items[index.row()]
+        if role == Qt.DisplayRole:
+            return item_title(m)
+        if role == Qt.UserRole:
+            return m
+        if role == CoverUrlRole:
+            return item_cover_url(m)
+        if role == Qt.DecorationRole:
+            url = item_cover_url(m)
+            return self.cover_lookup(url) if url else None
+        return None
+
+    def set_items(self, items: list[dict]):
+        self.beginResetModel()
+        self.items = list(items)
+        self.message = ""
+        self._rows_by_url = {}
+        for row, m in enumerate(self.items):
+            self._index_row(row, m)
+        self.endResetModel()
+
+    def append_items(self, items: list[dict]):
+        if not items:
+            return
+        if not self.items:
+            self.set_items(items)
+            return
+        start = len(self.items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        for row, m in enumerate(items, start):
+            self.items.append(m)
+            self._index_row(row, m)
+        self.endInsertRows()
+
+    def set_message(self, message: str):
+        self.beginResetModel()
+        self.items = []
+        self.message = message
+        self._rows_by_url = {}
+        self.endResetModel()
+
+    def rows_for_url(self, url: str) -> list[int]:
+        return self._rows_by_url.get(url, [])
+
+    def cover_ready(self, url: str):
+        for row in self.rows_for_url(url):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _index_row(self, row: int, m: dict):
+        url = item_cover_url(m)
+        if url:
+            self._rows_by_url.setdefault(url, []).append(row)
+
+
+class MangaCardDelegate(QStyledItemDelegate):
+    def __init__(self, request_cover: Callable[[str], None], parent=None):
+        super().__init__(parent)
+        self.request_cover = request_cover
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return CARD_SIZE
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        m = index.data(Qt.UserRole)
+        if not isinstance(m, dict):
+            painter.save()
+            painter.setPen(option.palette.text().color())
+            painter.drawText(option.rect, Qt.AlignCenter | Qt.TextWordWrap, index.data(Qt.DisplayRole) or "")
+            painter.restore()
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        x = option.rect.x() + (option.rect.width() - COVER_SIZE.width()) // 2
+        cover_rect = QRect(x, option.rect.y() + 4, COVER_SIZE.width(), COVER_SIZE.height())
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(cover_rect), COVER_RADIUS, COVER_RADIUS)
+
+        painter.fillPath(path, QColor(255, 255, 255, 15))
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap and not pixmap.isNull():
+            painter.setClipPath(path)
+            painter.drawPixmap(cover_rect, pixmap)
+            painter.setClipping(False)
+        else:
+            # Only rows that are actually painted ask for their cover.
+            url = index.data(CoverUrlRole)
+            if url:
+                self.request_cover(url)
+
+        if option.state & QStyle.State_MouseOver:
+            painter.fillPath(path, QColor(0, 0, 0, 60))
+        if option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlight().color())
+            painter.drawPath(path)
+
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(option.palette.text().color())
+        text_rect = QRect(option.rect.x() + 5, cover_rect.bottom() + 8, option.rect.width() - 10, 36)
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, index.data(Qt.DisplayRole) or "")
+        painter.restore()
@@ -1,5 +1,7 @@
 from .cover_build_worker import CoverSignals, CoverWorker
 from .cover_dl_worker import CoverDlSignals, CoverDlWorker
+from .cover_thumb_worker import CoverThumbSignals, CoverThumbWorker
+from .cover_scheduler import CoverFetchScheduler
 from .discover_worker import DiscoverSignals, DiscoverWorker
 
 __all__ = [
@@ -7,6 +9,9 @@ __all__ = [
     "CoverWorker",
     "CoverDlSignals",
     "CoverDlWorker",
+    "CoverThumbSignals",
+    "CoverThumbWorker",
+    "CoverFetchScheduler",
     "DiscoverSignals",
     "DiscoverWorker",
 ]
@@ -0,0 +1,75 @@
+import itertools
+from typing import Callable, Optional
+
+from PySide6.QtCore import QThreadPool, QTimer
+from PySide6.QtGui import QImage
+
+from app.core.config import COVER_FETCH_WORKERS
+from .cover_thumb_worker import CoverThumbSignals, CoverThumbWorker
+
+
+class CoverFetchScheduler:
+    def __init__(self, signals: CoverThumbSignals, priority: Callable[[str], Optional[int]],
+                 max_workers: int = COVER_FETCH_WORKERS):
+        self.signals = signals
+        self.priority = priority
+        # A private pool keeps cover downloads from starving discover and library workers, and vice versa.
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self.generation = 0
+        self.started = 0
+        self.dropped = 0
+        self._order = itertools.count()
+        self._queued: dict[str, int] = {}
+        self._running: set[str] = set()
+        self._dispatch_pending = False
+        self.signals.done.connect(self._on_done)
+
+    def request(self, url: str):
+        if url in self._queued or url in self._running:
+            return
+        self._queued[url] = next(self._order)
+        self._schedule_dispatch()
+
+    def reset(self):
+        # Queued covers belong to a grid that is no longer shown; rows that are still visible ask again on paint.
+        self.dropped += len(self._queued)
+        self._queued.clear()
+        self.generation += 1
+
+    def pending(self) -> int:
+        return len(self._queued) + len(self._running)
+
+    def shutdown(self):
+        self._queued.clear()
+        self.pool.clear()
+
+    def _schedule_dispatch(self):
+        # Requests arrive one by one during a paint pass; rank them together on the next loop turn.
+        if not self._dispatch_pending:
+            self._dispatch_pending = True
+            QTimer.singleShot(0, self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_pending = False
+        while self._queued and len(self._running) < self.pool.maxThreadCount():
+            ranked = []
+            for url, order in list(self._queued.items()):
+                distance = self.priority(url)
+                if distance is None:
+                    # Scrolled well out of view since it was requested.
+                    del self._queued[url]
+                    self.dropped += 1
+                    continue
+                ranked.append((distance, order, url))
+            if not ranked:
+                return
+            _, _, url = min(ranked)
+            del self._queued[url]
+            self._running.add(url)
+            self.started += 1
+            self.pool.start(CoverThumbWorker(str(self.generation), url, self.signals))
+
+    def _on_done(self, key: str, url: str, image: QImage):
+        self._running.discard(url)
+        self._schedule_dispatch()
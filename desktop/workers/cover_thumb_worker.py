@@ -0,0 +1,22 @@
+from pathlib import Path
+from PySide6.QtCore import QObject, Signal, QRunnable
+from PySide6.QtGui import QImage
+from app.services.cover_thumb_service import load_cover_thumbnail, load_file_thumbnail
+
+class CoverThumbSignals(QObject):
+    done = Signal(str, str, QImage)
+
+class CoverThumbWorker(QRunnable):
+    def __init__(self, key: str, url: str, signals: CoverThumbSignals, path: Path | None = None):
+        super().__init__()
+        self.key = key
+        self.url = url
+        self.signals = signals
+        self.path = path
+
+    def run(self):
+        try:
+            image = load_file_thumbnail(self.path) if self.path else load_cover_thumbnail(self.url)
+            self.signals.done.emit(self.key, self.url, image if image is not None else QImage())
+        except Exception:
+            self.signals.done.emit(self.key, self.url, QImage())
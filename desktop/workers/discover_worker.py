@@ -1,21 +1,39 @@
+from typing import Optional
+
 from PySide6.QtCore import QObject, Signal, QRunnable
+from app.core.cancel import CancelToken, OperationCancelled
 from app.services.anilist_service import trending as anilist_trending, search as anilist_search
+from app.services.anilist_service import cached_trending, cached_search
+
+def cached_discover_items(mode: str, query: str, page: int = 1, per_page: int = 24) -> Optional[tuple[list, bool]]:
+    hit = cached_search(query, page, per_page) if mode == "search" else cached_trending(page, per_page)
+    if hit is None:
+        return None
+    return hit.value, hit.fresh
 
 class DiscoverSignals(QObject):
-    done = Signal(list, str)
+    done = Signal(list, str, int, int)
 
 class DiscoverWorker(QRunnable):
-    def __init__(self, mode: str, query: str, signals: DiscoverSignals, page: int = 1, per_page: int = 24):
+    def __init__(self, mode: str, query: str, signals: DiscoverSignals, page: int = 1, per_page: int = 24,
+                 generation: int = 0, cancel: Optional[CancelToken] = None):
         super().__init__()
         self.mode = mode
         self.query = query
         self.signals = signals
         self.page = page
         self.per_page = per_page
+        self.generation = generation
+        self.cancel = cancel
 
     def run(self):
         try:
-            items = anilist_search(self.query, self.page, self.per_page) if self.mode == "search" else anilist_trending(self.page, self.per_page)
-            self.signals.done.emit(items, "")
+            if self.mode == "search":
+                items = anilist_search(self.query, self.page, self.per_page, cancel=self.cancel)
+            else:
+                items = anilist_trending(self.page, self.per_page, cancel=self.cancel)
+            self.signals.done.emit(items, "", self.page, self.generation)
+        except OperationCancelled:
+            return
         except Exception as e:
-            self.signals.done.emit([], str(e))
+            self.signals.done.emit([], str(e), self.page, self.generation)
@@ -3,6 +3,10 @@ import asyncio
 from PySide6.QtWidgets import QApplication
 from qasync import QEventLoop
 from desktop.ui import MainWindow
+from app.sources.mangadex import get_mangadex_source
+from app.services.page_loader import get_page_loader
+from app.services.cover_dl_service import migrate_legacy_covers
+from app.db.init_db import init_db
 
 def main():
     app = QApplication(sys.argv)
@@ -10,12 +14,17 @@ def main():
 
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
+    get_mangadex_source().bind_loop(loop)
+    init_db()
+    migrate_legacy_covers()
 
     w = MainWindow()
     w.show()
 
     with loop:
-        sys.exit(loop.run_forever())
+        code = loop.run_forever()
+        loop.run_until_complete(get_page_loader().close())
+        sys.exit(code)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,15 @@
 
 import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-def migrate_database(db_path: str = "data/mangareader.db"):
+from app.core.config import DB_PATH, DISK_CACHE_MB, MEMORY_CACHE_MB
+
+
+def migrate_database(db_path: str = str(DB_PATH)):
 
 
     db_file = Path(db_path)
@@ -44,6 +49,7 @@ def migrate_database(db_path: str = "data/mangareader.db"):
             ("download_path", "VARCHAR", None),
             ("created_at", "TIMESTAMP", None),
             ("updated_at", "TIMESTAMP", None),
+            ("chapters_complete", "BOOLEAN", "0"),
         ]
 
         print("Updating manga table schema...")
@@ -56,8 +62,25 @@ def migrate_database(db_path: str = "data/mangareader.db"):
                 print(f"  Added column: {col_name}")
 
 
+        cursor.execute("PRAGMA table_info(settings)")
+        settings_columns = {row[1] for row in cursor.fetchall()}
+
+        new_settings_columns = [
+            ("memory_cache_mb", "INTEGER", MEMORY_CACHE_MB),
+            ("disk_cache_mb", "INTEGER", DISK_CACHE_MB),
+        ]
+
+        if settings_columns:
+            print("Updating settings table schema...")
+            for col_name, col_type, default_value in new_settings_columns:
+                if col_name not in settings_columns:
+                    cursor.execute(f"ALTER TABLE settings ADD COLUMN {col_name} {col_type} NOT NULL DEFAULT {default_value}")
+                    print(f"  Added column: {col_name}")
+
+
         print("Making manga.path nullable...")
         try:
+            cursor.execute("DROP TABLE IF EXISTS manga_new")
             cursor.execute("""
                 CREATE TABLE manga_new (
                     id INTEGER PRIMARY KEY,
@@ -81,13 +104,27 @@ def migrate_database(db_path: str = "data/mangareader.db"):
                     last_opened TIMESTAMP,
                     open_count INTEGER DEFAULT 0,
                     created_at TIMESTAMP,
-                    updated_at TIMESTAMP
+                    updated_at TIMESTAMP,
+                    chapters_complete BOOLEAN NOT NULL DEFAULT 0
                 )
+            """)
+            cursor.execute("""
                 INSERT INTO manga_new 
                 SELECT id, title, source, source_id, cover_url, description, author, artist,
                        genres, tags, status, anilist_id, mal_id, mangadex_id, is_downloaded,
-                       download_path, path, is_favorite, last_opened, open_count, created_at, updated_at
+                       download_path, path, is_favorite, last_opened, open_count, created_at, updated_at,
+                       chapters_complete
                 FROM manga
+            """)
+            cursor.execute("DROP TABLE manga")
+            cursor.execute("ALTER TABLE manga_new RENAME TO manga")
+            print("  manga.path is now nullable")
+        except sqlite3.OperationalError as e:
+            print(f"  Skipped: {e}")
+
+
+        print("Creating new tables...")
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS chapter (
                 id INTEGER PRIMARY KEY,
                 manga_id INTEGER NOT NULL,
@@ -105,6 +142,9 @@ def migrate_database(db_path: str = "data/mangareader.db"):
                 updated_at TIMESTAMP,
                 FOREIGN KEY (manga_id) REFERENCES manga(id)
             )
+        """)
+        print("  Created chapter table")
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS page (
                 id INTEGER PRIMARY KEY,
                 chapter_id INTEGER NOT NULL,
@@ -118,6 +158,9 @@ def migrate_database(db_path: str = "data/mangareader.db"):
                 file_size INTEGER,
                 FOREIGN KEY (chapter_id) REFERENCES chapter(id)
             )
+        """)
+        print("  Created page table")
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS downloadqueue (
                 id INTEGER PRIMARY KEY,
                 manga_id INTEGER,
@@ -169,6 +212,5 @@ def migrate_database(db_path: str = "data/mangareader.db"):
 
 
 if __name__ == "__main__":
-    import sys
-    db_path = sys.argv[1] if len(sys.argv) > 1 else "data/mangareader.db"
+    db_path = sys.argv[1] if len(sys.argv) > 1 else str(DB_PATH)
     migrate_database(db_path)
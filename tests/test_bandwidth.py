@@ -0,0 +1,28 @@
+import pytest
+
+from app.core.bandwidth import BandwidthMeter
+from app.sources.at_home import AtHomeResolver
+
+
+async def _no_server(chapter_id):
+    raise AssertionError("not used")
+
+
+def test_latency_does_not_lower_throughput():
+    meter = BandwidthMeter()
+    # 50 KB data-saver page on a 2 MB/s link with 250 ms to first byte.
+    meter.record(50 * 1024, 0.275, 0.025)
+    assert meter.bytes_per_sec == pytest.approx(50 * 1024 / 0.025)
+    assert meter.seconds_per_fetch == 0.275
+
+
+def test_auto_quality_switches_back_once_the_link_recovers():
+    meter = BandwidthMeter()
+    resolver = AtHomeResolver(_no_server, meter)
+
+    meter.record(1024 * 1024, 4.0)
+    assert resolver.use_data_saver()
+
+    for _ in range(5):
+        meter.record(50 * 1024, 0.275, 0.025)
+    assert not resolver.use_data_saver()
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.cancel import CancelToken, OperationCancelled
+from app.sources.mangadex import MangaDexSource
+
+
+def _cancel_after(token: CancelToken, delay: float):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+def test_run_sync_cancels_on_private_loop():
+    source = MangaDexSource()
+    token = CancelToken()
+    stopped = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            stopped.append(True)
+            raise
+
+    _cancel_after(token, 0.05)
+    started = time.monotonic()
+    with pytest.raises(OperationCancelled):
+        source.run_sync(slow(), cancel=token)
+    assert time.monotonic() - started < 1
+    assert stopped == [True]
+
+
+def test_run_sync_cancels_task_on_shared_loop():
+    source = MangaDexSource()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    source.bind_loop(loop)
+    token = CancelToken()
+    stopped = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            stopped.set()
+            raise
+
+    try:
+        _cancel_after(token, 0.05)
+        with pytest.raises(OperationCancelled):
+            source.run_sync(slow(), cancel=token)
+        assert stopped.wait(1)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(1)
+
+
+def test_cancelled_token_skips_work():
+    source = MangaDexSource()
+    token = CancelToken()
+    token.cancel()
+    ran = []
+
+    async def work():
+        ran.append(True)
+
+    with pytest.raises(OperationCancelled):
+        source.run_sync(work(), cancel=token)
+    assert ran == []
+
+    called = []
+    with token.on_cancel(lambda: called.append(True)):
+        pass
+    assert called == [True]
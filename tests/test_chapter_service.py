@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from sqlmodel import SQLModel, create_engine, select
+
+from app.db import session as db_session
+from app.db.session import get_session
+from app.models import Chapter, Manga
+from app.services import chapter_service
+from app.services.chapter_service import fetch_and_store_chapters
+from app.sources.base import ChapterMetadata
+
+
+class _Feed:
+    def __init__(self, batches: list[list[str]], fail_at: int | None = None):
+        self.batches = batches
+        self.fail_at = fail_at
+        self.calls = 0
+
+    async def iter_chapters(self, source_id):
+        self.calls += 1
+        for i, batch in enumerate(self.batches):
+            await asyncio.sleep(0.01)
+            if i == self.fail_at:
+                raise RuntimeError("feed unavailable")
+            yield [ChapterMetadata(source_chapter_id=c, chapter_number=c) for c in batch]
+
+
+@pytest.fixture
+def manga_id(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(db_session, "engine", engine)
+    with get_session() as session:
+        manga = Manga(title="A", source="mangadex", mangadex_id="md-a")
+        session.add(manga)
+        session.commit()
+        return manga.id
+
+
+def _use_feed(monkeypatch, feed: _Feed):
+    monkeypatch.setattr(chapter_service, "get_mangadex_source", lambda: feed)
+
+
+def _stored(manga_id: int) -> list[str]:
+    with get_session() as session:
+        rows = session.exec(select(Chapter).where(Chapter.manga_id == manga_id)).all()
+        return sorted(c.source_chapter_id for c in rows)
+
+
+def _complete(manga_id: int) -> bool:
+    with get_session() as session:
+        return session.get(Manga, manga_id).chapters_complete
+
+
+def test_concurrent_streams_share_one_feed(manga_id, monkeypatch):
+    feed = _Feed([["1", "2"], ["3"]])
+    _use_feed(monkeypatch, feed)
+
+    async def main():
+        return await asyncio.gather(fetch_and_store_chapters(manga_id), fetch_and_store_chapters(manga_id))
+
+    first, second = asyncio.run(main())
+    assert feed.calls == 1
+    assert [c.source_chapter_id for c in first] == ["1", "2", "3"]
+    assert [c.source_chapter_id for c in second] == ["1", "2", "3"]
+    assert _stored(manga_id) == ["1", "2", "3"]
+    assert _complete(manga_id)
+
+
+def test_failed_feed_keeps_stored_chapters_and_resumes(manga_id, monkeypatch):
+    _use_feed(monkeypatch, _Feed([["1", "2"], ["3"]], fail_at=1))
+    with pytest.raises(RuntimeError):
+        asyncio.run(fetch_and_store_chapters(manga_id))
+    assert _stored(manga_id) == ["1", "2"]
+    assert not _complete(manga_id)
+
+    feed = _Feed([["1", "2"], ["3"]])
+    _use_feed(monkeypatch, feed)
+    chapters = asyncio.run(fetch_and_store_chapters(manga_id))
+    assert [c.source_chapter_id for c in chapters] == ["1", "2", "3"]
+    assert _stored(manga_id) == ["1", "2", "3"]
+    assert _complete(manga_id)
+
+    asyncio.run(fetch_and_store_chapters(manga_id))
+    assert feed.calls == 1
+
+
+def test_cancelled_stream_is_resumed_without_duplicates(manga_id, monkeypatch):
+    feed = _Feed([["1"], ["2"], ["3"]])
+    _use_feed(monkeypatch, feed)
+
+    async def main():
+        task = asyncio.ensure_future(fetch_and_store_chapters(manga_id))
+        await asyncio.sleep(0.015)
+        task.cancel()
+        await asyncio.sleep(0)
+        return await fetch_and_store_chapters(manga_id)
+
+    chapters = asyncio.run(main())
+    assert [c.source_chapter_id for c in chapters] == ["1", "2", "3"]
+    assert _stored(manga_id) == ["1", "2", "3"]
+    assert feed.calls == 2
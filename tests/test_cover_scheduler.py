@@ -0,0 +1,62 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QRunnable
+from PySide6.QtGui import QGuiApplication, QImage
+
+import desktop.workers.cover_scheduler as cover_scheduler
+from desktop.workers.cover_scheduler import CoverFetchScheduler
+from desktop.workers.cover_thumb_worker import CoverThumbSignals
+
+
+def _scheduler(monkeypatch, distances, workers=2):
+    QGuiApplication.instance() or QGuiApplication([])
+    started = []
+
+    class _Worker(QRunnable):
+        def __init__(self, key, url, signals):
+            super().__init__()
+            started.append(url)
+
+        def run(self):
+            pass
+
+    monkeypatch.setattr(cover_scheduler, "CoverThumbWorker", _Worker)
+    signals = CoverThumbSignals()
+    scheduler = CoverFetchScheduler(signals, distances.get, max_workers=workers)
+    return scheduler, signals, started
+
+
+def _finish(signals, url):
+    signals.done.emit("0", url, QImage())
+    QCoreApplication.processEvents()
+
+
+def test_nearest_covers_start_first_and_far_ones_are_dropped(monkeypatch):
+    distances = {"below": 300, "visible-a": 0, "gone": None, "visible-b": 0, "near": 40}
+    scheduler, signals, started = _scheduler(monkeypatch, distances)
+    for url in distances:
+        scheduler.request(url)
+    QCoreApplication.processEvents()
+    assert started == ["visible-a", "visible-b"]
+
+    _finish(signals, "visible-a")
+    _finish(signals, "visible-b")
+    assert started[2:] == ["near", "below"]
+    assert scheduler.dropped == 1
+    assert scheduler.pool.maxThreadCount() == 2
+
+
+def test_reset_cancels_queued_covers(monkeypatch):
+    distances = {f"cover-{i}": i for i in range(10)}
+    scheduler, signals, started = _scheduler(monkeypatch, distances)
+    for url in distances:
+        scheduler.request(url)
+    QCoreApplication.processEvents()
+
+    scheduler.reset()
+    _finish(signals, "cover-0")
+    _finish(signals, "cover-1")
+    assert started == ["cover-0", "cover-1"]
+    assert scheduler.pending() == 0
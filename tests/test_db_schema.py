@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+from sqlmodel import create_engine
+
+from app.core.config import DISK_CACHE_MB, MEMORY_CACHE_MB
+from app.db import init_db, session
+from app.services import settings_service
+
+
+@pytest.fixture
+def old_db(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE settings (id INTEGER PRIMARY KEY, library_root VARCHAR NOT NULL)")
+    conn.execute("INSERT INTO settings VALUES (1, '/library')")
+    conn.commit()
+    conn.close()
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(init_db, "engine", engine)
+    monkeypatch.setattr(init_db, "DB_PATH", path)
+    return path
+
+
+def test_init_db_adds_cache_columns_to_old_settings(old_db):
+    init_db.init_db()
+    init_db.init_db()
+
+    assert settings_service.get_library_root() == "/library"
+    assert settings_service.get_cache_limits() == (MEMORY_CACHE_MB, DISK_CACHE_MB)
+    assert settings_service.set_cache_limits(64, 500)
+    assert settings_service.get_cache_limits() == (64, 500)
+
+
+def test_upgrade_never_creates_a_settings_row(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(init_db, "engine", engine)
+    monkeypatch.setattr(init_db, "DB_PATH", path)
+
+    init_db.init_db()
+    assert settings_service.get_library_root() is None
+    assert not settings_service.set_cache_limits(64, 500)
+    assert settings_service.get_library_root() is None
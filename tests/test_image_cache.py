@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication, QImage
+
+from app.cache import MemoryPressureMonitor
+from app.cache.image_cache import ImageCache
+
+
+def _cache(tmp_path, disk_mb=1):
+    return ImageCache(max_memory_mb=1, max_disk_mb=disk_mb, cache_dir=tmp_path)
+
+
+def test_disk_usage_survives_restart_without_rescanning(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put_bytes("a", b"x" * 1000)
+    cache.put_bytes("b", b"y" * 500)
+
+    reopened = _cache(tmp_path)
+    assert reopened.get_stats()["disk_items"] == 2
+    assert reopened._disk_size == 1500
+    assert reopened.get_bytes("a") == b"x" * 1000
+
+
+def test_eviction_follows_last_access_not_write_order(tmp_path):
+    cache = _cache(tmp_path)
+    cache.max_disk_bytes = 3000
+    cache.put_bytes("old", b"1" * 1000)
+    cache.put_bytes("mid", b"2" * 1000)
+    cache.put_bytes("new", b"3" * 1000)
+    assert cache.get_bytes("old") is not None
+
+    cache.put_bytes("extra", b"4" * 1000)
+    assert cache.has("old")
+    assert not cache.has("mid")
+    assert cache._disk_size == 3000
+
+
+def test_existing_flat_cache_is_indexed_once(tmp_path):
+    (tmp_path / "deadbeef.cache").write_bytes(b"z" * 42)
+
+    cache = _cache(tmp_path)
+    assert cache._disk_size == 42
+    assert not list(tmp_path.glob("*.cache"))
+    assert (tmp_path / "de" / "ad" / "deadbeef.cache").read_bytes() == b"z" * 42
+
+    cache.clear_disk()
+    assert cache._disk_size == 0
+    assert not list(tmp_path.rglob("*.cache"))
+
+
+def test_flat_entries_written_after_indexing_are_migrated(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put_bytes("a", b"x" * 10)
+    cache._index.set_meta("layout", "flat")
+    path = cache._get_cache_path(cache._make_cache_key("a"))
+    path.replace(tmp_path / path.name)
+
+    reopened = _cache(tmp_path)
+    assert reopened.get_bytes("a") == b"x" * 10
+    assert reopened._disk_size == 10
+
+
+def test_concurrent_loads_of_one_key_run_once(tmp_path):
+    image = QImage(8, 8, QImage.Format_RGB32)
+    cache = _cache(tmp_path)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return image
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("page", load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is image for result in results)
+    assert cache.get_stats()["memory_items"] == 1
+
+
+def test_disk_hits_decode_to_qimage_off_the_gui_thread(tmp_path):
+    image = QImage(6, 4, QImage.Format_RGB32)
+    image.fill(0xff00ff00)
+    cache = _cache(tmp_path)
+    cache.put("page", image)
+    cache.clear_memory()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("page"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4 and all(isinstance(result, QImage) for result in results)
+    assert results[0].size() == image.size() and results[0].pixelColor(0, 0) == image.pixelColor(0, 0)
+    assert cache.get_stats()["disk_hits"] == 1
+
+
+def test_memory_is_accounted_in_real_bytes(tmp_path):
+    cache = _cache(tmp_path)
+    image = QImage(100, 50, QImage.Format_Grayscale8)
+    cache.put("gray", image, save_to_disk=False)
+    assert cache.memory_size == image.sizeInBytes()
+
+
+def test_memory_pressure_shrinks_and_restores_budget(tmp_path):
+    cache = ImageCache(max_memory_mb=64, max_disk_mb=1, cache_dir=tmp_path)
+    for i in range(4):
+        cache.put(f"page{i}", QImage(1024, 1024, QImage.Format_RGB32), save_to_disk=False)
+    assert cache.memory_size == 16 * 1024 * 1024
+
+    available = [100 * 1024 * 1024]
+    monitor = MemoryPressureMonitor(cache, low_memory_mb=108, min_budget_mb=4,
+                                    read_memory=lambda: (available[0], 1 << 33))
+    monitor.check()
+    assert cache.memory_budget == 8 * 1024 * 1024
+    assert cache.memory_size <= cache.memory_budget
+    assert not cache.has("page0") and cache.has("page3")
+
+    available[0] = 1 << 30
+    monitor.check()
+    assert cache.memory_budget == cache.max_memory_bytes
+
+
+def _scan_after_reuse(tmp_path, policy):
+    cache = ImageCache(max_memory_mb=1, max_disk_mb=1, cache_dir=tmp_path, policy=policy)
+    page = QImage(128, 128, QImage.Format_RGB32)
+    cache.max_memory_bytes = cache._memory_budget = page.sizeInBytes() * 8
+
+    hot = [f"hot{i}" for i in range(3)]
+    for key in hot:
+        cache.put(key, page, save_to_disk=False)
+    for i in range(8):
+        cache.put(f"filler{i}", page, save_to_disk=False)
+    for key in hot:
+        # Re-read after they were pushed out once, the way a reader flips back.
+        cache.put(key, page, save_to_disk=False)
+    for i in range(40):
+        cache.put(f"scan{i}", page, save_to_disk=False)
+    return sum(cache.get(key) is not None for key in hot), cache.get_stats()
+
+
+def test_two_queue_policy_keeps_hot_pages_through_a_scan(tmp_path):
+    kept_lru, lru_stats = _scan_after_reuse(tmp_path / "lru", "lru")
+    kept_2q, stats = _scan_after_reuse(tmp_path / "2q", "2q")
+    assert kept_lru == 0
+    assert kept_2q == 3
+    assert stats["policy"] == "2q" and stats["hits"] == 3
+    assert lru_stats["hit_rate"] == 0.0 and stats["hit_rate"] == 1.0
+
+
+def test_get_path_returns_indexed_files_only(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get_path("cover") is None
+
+    cache.put_bytes("cover", b"jpeg")
+    path = cache.get_path("cover")
+    assert path.read_bytes() == b"jpeg"
+
+    path.unlink()
+    assert cache.get_path("cover") is None
+    assert cache._disk_size == 0
+
+
+def test_legacy_cover_dir_is_removed_once(tmp_path):
+    from app.services.cover_dl_service import migrate_legacy_covers
+
+    cache = _cache(tmp_path / "covers")
+    legacy = tmp_path / "anilist_covers"
+    legacy.mkdir()
+    (legacy / "abc.jpg").write_bytes(b"jpeg")
+
+    assert migrate_legacy_covers(cache, legacy)
+    assert not legacy.exists()
+
+    legacy.mkdir()
+    assert not migrate_legacy_covers(_cache(tmp_path / "covers"), legacy)
+    assert legacy.exists()
+
+
+def test_hit_rate_counts_memory_misses(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("hit", QImage(4, 4, QImage.Format_RGB32), save_to_disk=False)
+    cache.put_bytes("on-disk", b"jpeg")
+
+    for i in range(10):
+        assert cache.get_memory(f"missing{i}") is None
+    assert cache.get_memory("hit") is not None
+    assert cache.get_memory("on-disk") is None
+    assert cache.get_bytes("on-disk") == b"jpeg"
+    assert cache.get_memory("hit", count=False) is not None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["disk_hits"]) == (1, 11, 1)
+    assert stats["hit_rate"] == 1 / 12
+
+
+def test_local_cover_thumbnail_is_built_once(tmp_path, monkeypatch):
+    from app.cache import image_cache
+    from app.services.cover_thumb_service import CARD_COVER_SIZE, cached_cover_thumbnail, load_file_thumbnail, \
+        remember_cover_thumbnail
+
+    QGuiApplication.instance() or QGuiApplication([])
+    monkeypatch.setitem(image_cache._global_caches, "covers", ImageCache(cache_dir=tmp_path / "covers"))
+    cover = tmp_path / "cover.png"
+    QImage(800, 1200, QImage.Format_RGB32).save(str(cover))
+
+    thumb = load_file_thumbnail(cover)
+    assert thumb.size() == CARD_COVER_SIZE
+    cover.unlink()
+    assert load_file_thumbnail(cover).size() == CARD_COVER_SIZE
+
+    assert cached_cover_thumbnail(str(cover)) is None
+    remember_cover_thumbnail(str(cover), thumb)
+    assert cached_cover_thumbnail(str(cover)).size() == CARD_COVER_SIZE
@@ -0,0 +1,118 @@
+import asyncio
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize
+from PySide6.QtGui import QGuiApplication, QImage
+
+from app.cache.image_cache import ImageCache
+from app.models import Chapter, Page
+from app.services.display_scaler import DisplayScaler
+from app.services.page_loader import PageLoader
+
+
+def _png(size: int = 10) -> bytes:
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(0xff0000)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+class _SlowSource:
+    def __init__(self):
+        self.calls = []
+        self.data = _png()
+        self.saver = False
+
+    def use_data_saver(self):
+        return self.saver
+
+    async def download_page(self, chapter_id, url, data_saver=False):
+        self.calls.append((url, data_saver) if data_saver else url)
+        await asyncio.sleep(0.05)
+        return _png(5) if data_saver else self.data
+
+
+def _loader(tmp_path):
+    QGuiApplication.instance() or QGuiApplication([])
+    loader = PageLoader()
+    loader.image_cache = ImageCache(cache_dir=tmp_path)
+    loader._sources = {"mangadex": _SlowSource()}
+    chapter = Chapter(id=1, manga_id=1, source="mangadex", source_chapter_id="c", chapter_number="1")
+    return loader, chapter
+
+
+def test_concurrent_loads_share_one_download(tmp_path):
+    loader, chapter = _loader(tmp_path)
+    page = Page(id=1, chapter_id=1, page_number=1, remote_url="http://cdn/1.png")
+
+    async def main():
+        prefetch = asyncio.ensure_future(loader.load_page_image(chapter, page))
+        reader = asyncio.ensure_future(loader.load_page_image(chapter, page))
+        await asyncio.sleep(0.01)
+        prefetch.cancel()
+        return await reader
+
+    assert asyncio.run(main()).width() == 10
+    assert loader._sources["mangadex"].calls == ["http://cdn/1.png"]
+    assert not loader._inflight
+
+
+def test_abandoned_load_is_cancelled(tmp_path):
+    loader, chapter = _loader(tmp_path)
+    page = Page(id=1, chapter_id=1, page_number=1, remote_url="http://cdn/1.png")
+
+    async def main():
+        prefetch = asyncio.ensure_future(loader.load_page_image(chapter, page))
+        await asyncio.sleep(0.01)
+        prefetch.cancel()
+        await asyncio.sleep(0.1)
+        return loader.image_cache.has("http://cdn/1.png")
+
+    assert asyncio.run(main()) is False
+    assert not loader._inflight
+
+
+def test_disk_cached_page_decodes_to_qimage_and_scales(tmp_path):
+    loader, chapter = _loader(tmp_path)
+    page = Page(id=1, chapter_id=1, page_number=1, remote_url="http://cdn/1.png")
+    loader.image_cache.put_bytes("http://cdn/1.png", _png())
+    scaler = DisplayScaler(loader.image_cache, loader.decoder)
+
+    async def main():
+        assert loader.get_cached_image(page) is None
+        image = await loader.load_page_image(chapter, page)
+        pixmap = await scaler.scaled(loader.cache_id(page), image, QSize(20, 20))
+        return image, pixmap
+
+    image, pixmap = asyncio.run(main())
+    assert isinstance(image, QImage) and image.width() == 10
+    assert pixmap.width() == 20
+    assert loader._sources["mangadex"].calls == []
+    assert isinstance(loader.get_cached_image(page), QImage)
+
+
+def test_data_saver_pages_do_not_replace_full_quality(tmp_path):
+    loader, chapter = _loader(tmp_path)
+    source = loader._sources["mangadex"]
+    page = Page(id=1, chapter_id=1, page_number=1, remote_url="http://cdn/data/h/1.png")
+
+    source.saver = True
+    low = loader.cache_id(page)
+    assert asyncio.run(loader.load_page_image(chapter, page)).width() == 5
+    assert source.calls == [("http://cdn/data/h/1.png", True)]
+
+    source.saver = False
+    assert loader.cache_id(page) == "http://cdn/data/h/1.png" != low
+    assert asyncio.run(loader.load_page_image(chapter, page)).width() == 10
+    assert source.calls[-1] == "http://cdn/data/h/1.png"
+
+    # Back in data-saver mode the full-quality copy on disk is preferred to a new download.
+    source.saver = True
+    loader.image_cache.clear_memory()
+    assert asyncio.run(loader.load_page_image(chapter, page)).width() == 10
+    assert len(source.calls) == 2
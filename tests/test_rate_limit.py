@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from app.sources import rate_limit
+from app.sources.rate_limit import TokenBucket, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_then_spacing(clock):
+    bucket = TokenBucket(rate=5, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.2)
+    assert bucket.reserve() == pytest.approx(0.4)
+
+    clock.now += 0.4
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_refill_never_exceeds_capacity(clock):
+    bucket = TokenBucket(rate=5, capacity=2)
+    bucket.reserve()
+    clock.now += 60
+    assert bucket.stats()["tokens"] == 2
+    assert [bucket.reserve() for _ in range(3)][-1] == pytest.approx(0.2)
+
+
+def test_block_for_delays_and_drains(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+    bucket.block_for(3)
+    assert bucket.reserve() == pytest.approx(3.0)
+
+    clock.now += 3
+    assert bucket.reserve() == 0.0
+    assert bucket.stats()["blocked_for"] == 0
+
+
+def test_block_for_keeps_longest_block(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+    bucket.block_for(10)
+    bucket.block_for(2)
+    assert bucket.stats()["blocked_for"] == pytest.approx(10)
+
+
+def test_headers_lower_tokens_and_block_when_exhausted(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+    bucket.update_from_headers({"X-RateLimit-Remaining": "1"})
+    assert bucket.stats()["tokens"] == 1
+
+    bucket.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Retry-After": "4"})
+    assert bucket.stats()["blocked_for"] == pytest.approx(4)
+    assert bucket.reserve() == pytest.approx(4)
+
+
+def test_header_limit_lowers_and_recovers_capacity(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+    bucket.update_from_headers({"X-RateLimit-Limit": "2"})
+    assert bucket.capacity == 2
+
+    bucket.update_from_headers({"X-RateLimit-Limit": "4"})
+    assert bucket.capacity == 4
+
+    bucket.update_from_headers({"X-RateLimit-Limit": "40"})
+    assert bucket.capacity == 5
+
+
+def test_malformed_headers_are_ignored(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+    bucket.update_from_headers({"X-RateLimit-Limit": "lots", "X-RateLimit-Remaining": ""})
+    assert bucket.capacity == 5
+    assert bucket.stats()["tokens"] == 5
+
+
+def test_retry_after_seconds_parsing(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 2_000_000_000.0)
+    assert retry_after_seconds({}) is None
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert retry_after_seconds({"Retry-After": "7"}) == 7
+    assert retry_after_seconds({"Retry-After": "-3"}) == 0
+    assert retry_after_seconds({"X-RateLimit-Retry-After": "2", "Retry-After": "9"}) == 2
+    assert retry_after_seconds({"X-RateLimit-Retry-After": "2000000012"}) == pytest.approx(12)
+
+
+def test_acquire_waits_for_reserved_slot():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def main():
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 0.09
@@ -0,0 +1,148 @@
+import asyncio
+
+from app.models import Chapter, Page
+from app.services import read_ahead
+from app.services.read_ahead import ReadAheadScheduler
+
+
+class _Bandwidth:
+    def __init__(self, fetch_seconds=None):
+        self.fetch_seconds = fetch_seconds
+
+    def estimate_fetch_seconds(self):
+        return self.fetch_seconds
+
+
+class _Loader:
+    def __init__(self, fetch_seconds=None):
+        self.loaded = []
+        self.bandwidth = _Bandwidth(fetch_seconds)
+
+    async def load_page_image(self, chapter, page):
+        self.loaded.append((chapter.id, page.page_number))
+
+
+def _scheduler(monkeypatch, fetch):
+    nxt = Chapter(id=2, manga_id=1, source="mangadex", source_chapter_id="c2", chapter_number="2")
+    monkeypatch.setattr(read_ahead, "get_next_chapter", lambda chapter_id: nxt)
+    monkeypatch.setattr(read_ahead, "fetch_and_store_pages", fetch)
+    loader = _Loader()
+    scheduler = ReadAheadScheduler(loader, next_chapter_pages=2)
+    chapter = Chapter(id=1, manga_id=1, source="mangadex", source_chapter_id="c1", chapter_number="1")
+    return scheduler, loader, chapter
+
+
+def test_finished_warm_up_is_forgotten_and_not_repeated(monkeypatch):
+    calls = []
+
+    async def fetch(chapter_id):
+        calls.append(chapter_id)
+        return [Page(id=i, chapter_id=chapter_id, page_number=i) for i in range(1, 4)]
+
+    scheduler, loader, chapter = _scheduler(monkeypatch, fetch)
+
+    async def main():
+        scheduler.prefetch_next_chapter(chapter)
+        await asyncio.sleep(0.01)
+        scheduler.prefetch_next_chapter(chapter)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert scheduler._next_chapter_tasks == {}
+    assert calls == [2]
+    assert loader.loaded == [(2, 1), (2, 2)]
+
+
+def test_failed_warm_up_is_retried(monkeypatch):
+    calls = []
+
+    async def fetch(chapter_id):
+        calls.append(chapter_id)
+        if len(calls) == 1:
+            raise RuntimeError("offline")
+        return [Page(id=1, chapter_id=chapter_id, page_number=1)]
+
+    scheduler, loader, chapter = _scheduler(monkeypatch, fetch)
+    scheduler.NEXT_CHAPTER_RETRY_SECONDS = 0.02
+
+    async def main():
+        scheduler.prefetch_next_chapter(chapter)
+        await asyncio.sleep(0.01)
+        scheduler.prefetch_next_chapter(chapter)
+        assert calls == [2]
+        await asyncio.sleep(0.03)
+        scheduler.prefetch_next_chapter(chapter)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert scheduler._next_chapter_tasks == {}
+    assert calls == [2, 2]
+    assert loader.loaded == [(2, 1)]
+
+
+def test_cancel_stops_running_warm_up(monkeypatch):
+    async def fetch(chapter_id):
+        await asyncio.sleep(5)
+        return []
+
+    scheduler, _, chapter = _scheduler(monkeypatch, fetch)
+
+    async def main():
+        scheduler.prefetch_next_chapter(chapter)
+        task = scheduler._next_chapter_tasks[1]
+        await asyncio.sleep(0)
+        scheduler.cancel()
+        await asyncio.sleep(0)
+        return task
+
+    task = asyncio.run(main())
+    assert task.cancelled()
+    assert scheduler._next_chapter_tasks == {}
+
+
+def _reading(fetch_seconds, pages, seconds_per_turn):
+    scheduler = ReadAheadScheduler(_Loader(fetch_seconds))
+    for i, page in enumerate(pages):
+        scheduler.record_turn(page, now=100.0 + i * seconds_per_turn)
+    return scheduler
+
+
+def test_window_starts_at_minimum_without_history():
+    scheduler = ReadAheadScheduler(_Loader())
+    assert scheduler.window() == (2, 1)
+    assert scheduler.plan(5, 20) == [6, 7, 4]
+
+
+def test_window_grows_with_reading_speed_and_fetch_time():
+    assert _reading(1.0, [0, 1, 2, 3], 1.0).window() == (3, 1)
+    assert _reading(1.0, [0, 1, 2, 3], 0.25).window() == (7, 1)
+    assert _reading(None, [0, 1, 2, 3], 0.25).window() == (7, 1)
+    assert _reading(2.0, [0, 1, 2, 3], 0.05).window() == (12, 2)
+
+
+def test_idle_or_jump_restarts_speed_history():
+    scheduler = _reading(1.0, [0, 1, 2], 0.25)
+    scheduler.record_turn(3, now=200.0)
+    assert scheduler.turn_interval() is None
+    assert scheduler.window() == (2, 1)
+
+    scheduler = _reading(1.0, [0, 1, 2], 0.25)
+    scheduler.record_turn(15, now=100.75)
+    assert scheduler.turn_interval() is None
+
+
+def test_plan_prefers_reading_direction():
+    forward = _reading(1.0, [8, 9, 10], 1.0)
+    assert forward.heading() == 1
+    assert forward.plan(10, 20) == [11, 12, 9, 13]
+
+    backward = _reading(1.0, [10, 9, 8], 1.0)
+    assert backward.heading() == -1
+    assert backward.plan(8, 20) == [7, 6, 5, 9]
+
+
+def test_plan_is_clamped_to_the_chapter():
+    scheduler = _reading(2.0, [0, 1, 2, 3], 0.05)
+    assert scheduler.plan(19, 20) == [18, 17]
+    assert scheduler.plan(0, 3) == [1, 2]
+
@@ -0,0 +1,182 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from app.sources.http import CircuitOpenError, RetryPolicy
+from app.sources.mangadex import MangaDexSource
+
+FAST = RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.05, timeout=0.5, connect_timeout=0.5)
+
+
+async def _serve(routes: dict):
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def _run(routes: dict, body, policy: RetryPolicy = FAST):
+    async def main():
+        runner, base = await _serve(routes)
+        source = MangaDexSource(base_url=base, retry_policy=policy)
+        try:
+            return await body(source, base)
+        finally:
+            await source.close()
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+def test_retries_server_errors_then_succeeds():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) < 3:
+            return web.Response(status=503)
+        return web.json_response({"data": []})
+
+    async def body(source, base):
+        return await source._request("/manga")
+
+    assert _run({"/manga": handler}, body) == {"data": []}
+    assert len(calls) == 3
+
+
+def test_gives_up_after_attempts_and_records_metrics():
+    async def handler(request):
+        return web.Response(status=500)
+
+    async def body(source, base):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await source._request("/manga")
+        return source.metrics.snapshot()
+
+    metrics = _run({"/manga": handler}, body)
+    assert metrics["request"] == 3
+    assert metrics["retry:500"] == 2
+    assert metrics["failure:500"] == 1
+
+
+def test_short_retry_after_is_waited_out_in_full():
+    calls = []
+
+    async def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.04"})
+        return web.json_response({"ok": True})
+
+    async def body(source, base):
+        return await source._request("/manga")
+
+    assert _run({"/manga": handler}, body) == {"ok": True}
+    assert calls[1] - calls[0] >= 0.04
+
+
+def test_long_retry_after_fails_fast_and_blocks_the_bucket():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.Response(status=429, headers={"X-RateLimit-Retry-After": str(int(time.time()) + 60)})
+
+    async def body(source, base):
+        started = time.monotonic()
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await source._request("/manga")
+        return error.value.status, time.monotonic() - started, source.rate_limit_stats()["api"]
+
+    status, elapsed, bucket = _run({"/manga": handler}, body)
+    assert status == 429 and len(calls) == 1
+    assert elapsed < 1.0
+    assert bucket["blocked_for"] > 50
+
+
+def test_timeouts_are_retried_for_images():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return web.Response(body=b"img")
+
+    async def body(source, base):
+        return await source.download_image(f"{base}/data/x.jpg")
+
+    assert _run({"/data/x.jpg": handler}, body) == b"img"
+    assert len(calls) == 2
+
+
+def test_circuit_opens_after_repeated_failures():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.Response(status=502)
+
+    async def body(source, base):
+        source._http.failure_threshold = 2
+        with pytest.raises(CircuitOpenError):
+            await source._request("/manga")
+        with pytest.raises(CircuitOpenError):
+            await source._request("/manga")
+        return source.metrics.snapshot()
+
+    metrics = _run({"/manga": handler}, body)
+    assert len(calls) == 2
+    assert metrics["rejected:circuit_open"] == 2
+
+
+def test_half_open_circuit_allows_a_single_probe():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) <= 2:
+            return web.Response(status=502)
+        await asyncio.sleep(0.05)
+        return web.json_response({"ok": True})
+
+    async def body(source, base):
+        source._http.failure_threshold = 2
+        source._http.reset_timeout = 0.05
+        with pytest.raises(CircuitOpenError):
+            await source._request("/manga")
+        await asyncio.sleep(0.06)
+        return await asyncio.gather(*(source._request("/manga") for _ in range(5)), return_exceptions=True)
+
+    results = _run({"/manga": handler}, body)
+    assert len(calls) == 3
+    assert sum(result == {"ok": True} for result in results) == 1
+    assert sum(isinstance(result, CircuitOpenError) for result in results) == 4
+
+
+def test_timed_download_excludes_time_to_first_byte():
+    chunk = b"x" * 64 * 1024
+
+    async def handler(request):
+        await asyncio.sleep(0.3)
+        response = web.StreamResponse()
+        response.content_length = len(chunk) * 4
+        await response.prepare(request)
+        for _ in range(4):
+            await response.write(chunk)
+            await asyncio.sleep(0.01)
+        return response
+
+    async def body(source, base):
+        return await source._http.get_bytes_timed(f"{base}/data/x.jpg")
+
+    data, transfer = _run({"/data/x.jpg": handler}, body)
+    assert len(data) == len(chunk) * 4
+    assert transfer < 0.25
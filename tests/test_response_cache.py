@@ -0,0 +1,109 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from app.core.response_cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr("app.core.response_cache.time.time", clock)
+    return clock
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault("ttls", {"search": 60})
+    kwargs.setdefault("max_stale", 3600)
+    return ResponseCache(tmp_path / "responses.db", **kwargs)
+
+
+def test_normalized_params_share_an_entry_across_restarts(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.put("search", {"title": "One  Piece", "tags": ["b", "a"], "page": 1, "unused": None}, [1, 2])
+    cache.close()
+
+    cache = _cache(tmp_path)
+    hit = cache.get("search", {"page": 1, "tags": ["a", "b"], "title": "one piece"})
+    assert hit.value == [1, 2] and hit.fresh
+    assert cache.get("search", {"page": 2, "tags": ["a", "b"], "title": "one piece"}) is None
+
+
+def test_stale_entries_are_served_only_when_allowed(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.put("search", {"q": "x"}, ["old"])
+
+    clock.now += 120
+    assert cache.get("search", {"q": "x"}) is None
+    stale = cache.get("search", {"q": "x"}, allow_stale=True)
+    assert stale.value == ["old"] and not stale.fresh
+
+    clock.now += 3600
+    assert cache.get("search", {"q": "x"}, allow_stale=True) is None
+
+
+def test_fetch_refreshes_stale_and_falls_back_on_error(tmp_path, clock):
+    cache = _cache(tmp_path)
+    calls = []
+
+    def load():
+        calls.append(True)
+        return ["new"]
+
+    cache.put("search", {"q": "x"}, ["old"])
+    assert cache.fetch("search", {"q": "x"}, load) == ["old"]
+    assert calls == []
+
+    clock.now += 120
+    assert cache.fetch("search", {"q": "x"}, load) == ["new"]
+    assert calls == [True]
+
+    def fail():
+        raise ConnectionError("offline")
+
+    clock.now += 120
+    assert asyncio.run(cache.fetch_async("search", {"q": "x"}, _async(fail))) == ["new"]
+    with pytest.raises(ConnectionError):
+        cache.fetch("search", {"q": "never cached"}, fail)
+
+
+def _async(fn):
+    async def wrapper():
+        return fn()
+    return wrapper
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path, clock):
+    payload = "x" * 400
+    cache = _cache(tmp_path, max_mb=1500 / (1024 * 1024))
+    for i in range(3):
+        cache.put("search", {"q": i}, payload)
+        clock.now += 1
+    cache.get("search", {"q": 0})
+    clock.now += 1
+    cache.put("search", {"q": 3}, payload)
+
+    assert cache.get("search", {"q": 1}) is None
+    assert cache.get("search", {"q": 0}) is not None
+    assert cache.get_stats()["size_kb"] * 1024 <= 1500
+
+
+def test_api_clients_do_not_import_qt():
+    code = ("import sys, app.sources.mangadex, app.services.anilist_service; "
+            "sys.exit(any(m.startswith('PySide6') for m in sys.modules))")
+    root = Path(__file__).resolve().parents[1]
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0